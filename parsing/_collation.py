@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Sort keys for the language-specific alphabetical order given by a
+Sorting_Sequence table (SortingSequence or OntologySortingSequence).
+
+The Sequence field lists the letters (graphemes) of the alphabet in order,
+each with its lower case then capital form, e.g. "a/A|b/B|ch/Ch".  A
+grapheme can have more than one character; the text is split into
+graphemes longest match first.  Characters in IgnoredCharacters are
+skipped, and characters not in the sequence sort after all letters, in
+code point order.
+
+A sort key is a pair of strings with one character per grapheme: the
+first encodes its position in the alphabet, the second its case.  Thus
+words are ordered by letters first and case only breaks ties.  The keys
+are built with str.translate and compared by sorted() without any
+Python-level comparisons.
+
+============================================================================"""
+
+import re
+
+# Start of the placeholders for multi-character graphemes.
+_PLACEHOLDER_BASE = 0x100000
+
+#==============================================================================
+
+class _CodeTable(dict):
+    """str.translate table giving codes also for characters not in it."""
+
+    # Code of a character not in the table is its code point plus offset
+    # (or chr(1) if offset is None).
+    offset = None
+
+    def __missing__(self, key):
+        self[key] = chr(1) if self.offset is None else (
+            chr(min(key + self.offset, 0x10ffff)))
+        return self[key]
+
+#------------------------------------------------------------------------------
+
+def compile_sort_key(table_object, record: int = 0):
+    """Make a key= function from an imported Sorting_Sequence table.
+
+    Usage: sorted(words, key=compile_sort_key(sorting_sequence))
+    """
+
+    assert table_object._is_set, (
+        'Error: cannot compile because table has not been set.')
+
+    rule = table_object._rules[record]
+
+    # Map each grapheme to its (primary, secondary) codes.
+    # Graphemes of more than one character are first replaced by a single
+    # placeholder character (from a private use plane).
+
+    primaries = _CodeTable()
+    secondaries = _CodeTable()
+    multi = {}
+    primary = 0
+
+    for variants in rule['Sequence']:
+        if variants == []:
+            continue
+        primary += 1
+        for secondary, grapheme in enumerate(variants):
+            if len(grapheme) > 1 and grapheme not in multi:
+                multi[grapheme] = chr(_PLACEHOLDER_BASE + len(multi))
+            c = multi.get(grapheme, grapheme)
+            if c != '' and ord(c) not in primaries:
+                primaries[ord(c)] = chr(primary)
+                secondaries[ord(c)] = chr(1 + secondary)
+
+    # Characters not in the sequence sort after it, in code point order.
+    primaries.offset = primary + 1
+    secondaries.offset = None
+
+    # Longest match first.
+    graphemes = sorted(multi, key=len, reverse=True)
+    tokenizer = re.compile('|'.join([re.escape(g) for g in graphemes]))
+    placeholder = lambda m: multi[m.group()]
+
+    ignored = {ord(c): None for c in rule['IgnoredCharacters']}
+
+    def sort_key(word: str) -> tuple:
+        """Sort key of a word."""
+        word = word.translate(ignored)
+        if multi:
+            word = tokenizer.sub(placeholder, word)
+        return (word.translate(primaries), word.translate(secondaries))
+
+    return sort_key
+
+#------------------------------------------------------------------------------
+
+def sort_words(words, table_object, key=None) -> list:
+    """Sort words (or records, using key to get the word) in the order
+    given by a Sorting_Sequence table.
+
+    Each sort key is computed only once per item.
+    """
+
+    sort_key = compile_sort_key(table_object)
+
+    if key is None:
+        return sorted(words, key=sort_key)
+
+    return sorted(words, key=lambda item: sort_key(key(item)))
+
+#==============================================================================
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Random access to the rows of a (large) CSV file as written by mdb-export.
+
+Fields can contain quoted line breaks (e.g. InputStructures), so the
+start of a row can't be found without scanning the file.  The file is
+scanned once to record the byte offset of each row; the offsets are kept
+in a sidecar file (<file>.idx) which is reused as long as the CSV file's
+size and modification time are unchanged.  Rows are then read by parsing
+only their own bytes out of an mmap of the file.
+
+Row 0 is the header, as in the tables passed to import_table.
+
+============================================================================"""
+
+import os
+import sys
+import io
+import re
+import csv
+import mmap
+import struct
+from array import array
+
+# Avoid csv size failure (as in tester).
+csv.field_size_limit(sys.maxsize)
+
+# One record: unquoted characters or quoted fields, up to a line feed.
+_RECORD = re.compile(rb'(?:[^"\n]+|"[^"]*")*\n?')
+
+_INDEX_MAGIC = b'PTIDX1\0\0'
+_INDEX_HEADER = struct.Struct('<8sQQ') # magic, file size, mtime (ns)
+
+#------------------------------------------------------------------------------
+
+def build_row_index(data) -> array:
+    """Byte offsets of the rows of CSV data (bytes, mmap), plus the end."""
+
+    offsets = array('Q', [0])
+    match = _RECORD.match
+    size = len(data)
+
+    pos = 0
+    while pos < size:
+        end = match(data, pos).end()
+        # Unbalanced quote: the rest of the data is one record.
+        pos = end if end > pos else size
+        offsets.append(pos)
+
+    return offsets
+
+#------------------------------------------------------------------------------
+
+def load_row_index(path: str) -> array:
+    """Row offsets of a CSV file, from its sidecar index if up to date,
+    else by scanning it (and writing the sidecar)."""
+
+    stat = os.stat(path)
+    index_path = path + '.idx'
+
+    try:
+        with open(index_path, 'rb') as fp:
+            magic, size, mtime = _INDEX_HEADER.unpack(
+                fp.read(_INDEX_HEADER.size))
+            if (magic, size, mtime) == (
+                _INDEX_MAGIC, stat.st_size, stat.st_mtime_ns):
+                offsets = array('Q')
+                offsets.frombytes(fp.read())
+                return offsets
+    except (OSError, struct.error):
+        pass
+
+    with open(path, 'rb') as fp:
+        if stat.st_size == 0:
+            offsets = array('Q', [0])
+        else:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                offsets = build_row_index(mm)
+
+    try:
+        with open(index_path, 'wb') as fp:
+            fp.write(_INDEX_HEADER.pack(
+                _INDEX_MAGIC, stat.st_size, stat.st_mtime_ns))
+            fp.write(offsets.tobytes())
+    except OSError:
+        # E.g. read-only directory: just don't keep the index.
+        pass
+
+    return offsets
+
+#==============================================================================
+
+class CsvRowReader:
+    """
+    Read rows of a CSV file by number without parsing the whole file.
+
+    Usage:
+        with CsvRowReader(file_path) as reader:
+            table_object.import_table(reader.table([n]))
+    """
+
+    def __init__(self, path: str, encoding: str = 'utf-8'):
+        """Open the file and load (or build) its row index."""
+
+        self._encoding = encoding
+        self._offsets = load_row_index(path)
+        self._fp = open(path, 'rb')
+        self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ
+            ) if len(self._offsets) > 1 else b''
+
+#------------------------------------------------------------------------------
+
+    def close(self):
+        """Release the file."""
+
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+#------------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        """Number of rows, including the header."""
+
+        return len(self._offsets) - 1
+
+#------------------------------------------------------------------------------
+
+    def rows(self, start: int, stop: int) -> list:
+        """Rows start to stop-1 (parsed lists of fields)."""
+
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start >= stop:
+            return []
+
+        text = self._mm[self._offsets[start]:self._offsets[stop]].decode(
+            self._encoding)
+
+        return [row for row in csv.reader(io.StringIO(text, newline=''))]
+
+#------------------------------------------------------------------------------
+
+    def row(self, n: int) -> list:
+        """Row number n (0 is the header)."""
+
+        if n < 0:
+            n += len(self)
+        if not 0 <= n < len(self):
+            raise IndexError('row index out of range')
+
+        return self.rows(n, n+1)[0]
+
+#------------------------------------------------------------------------------
+
+    def table(self, row_numbers) -> list:
+        """The header followed by the given rows, ready for import_table."""
+
+        return [self.row(0)] + [self.row(n) for n in row_numbers]
+
+#==============================================================================
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Incremental decoding of CSV (as written by mdb-export) from a byte stream.
+
+Bytes are given in arbitrary chunks (e.g. as read from a subprocess pipe);
+rows are returned as soon as they are complete.  Quoted fields can be
+very large and contain line breaks (e.g. InputStructures), so a line feed
+only ends a record if it is not inside quotes; each chunk is scanned once,
+and the pieces of a record are joined only when it is complete.
+
+Usage:
+    decoder = CsvStreamDecoder()
+    for chunk in chunks:
+        rows += decoder.feed(chunk)
+    rows += decoder.close()
+
+============================================================================"""
+
+import sys
+import csv
+import codecs
+
+# Avoid csv size failure (as in tester).
+csv.field_size_limit(sys.maxsize)
+
+CHUNK_SIZE = 1 << 16
+
+#==============================================================================
+
+class RecordSplitter:
+    """
+    Split CSV text, given in arbitrary chunks, into complete records.
+
+    A line feed ends a record unless it is inside a quoted field, i.e.
+    unless an odd number of quotes precedes it in the record.
+    """
+
+    def __init__(self):
+        """Constructor for class."""
+
+        self._pending = []
+        self._in_quotes = False
+
+    def feed(self, text: str) -> list:
+        """Add text; returns the records completed by it."""
+
+        records = []
+        lines = text.split('\n')
+
+        for line in lines[:-1]:
+            self._pending.append(line + '\n')
+            if line.count('"') % 2:
+                self._in_quotes = not self._in_quotes
+            if not self._in_quotes:
+                records.append(''.join(self._pending))
+                self._pending = []
+
+        if lines[-1]:
+            self._pending.append(lines[-1])
+            if lines[-1].count('"') % 2:
+                self._in_quotes = not self._in_quotes
+
+        return records
+
+    def close(self) -> list:
+        """The last record, if not terminated by a line feed."""
+
+        records = [''.join(self._pending)] if self._pending else []
+        self._pending = []
+        return records
+
+#==============================================================================
+
+class CsvStreamDecoder:
+    """
+    Decode CSV rows from bytes given in chunks.
+    """
+
+    def __init__(self, encoding: str = 'utf-8'):
+        """Constructor for class."""
+
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._splitter = RecordSplitter()
+
+    def feed(self, data: bytes) -> list:
+        """Add bytes; returns the rows completed by them."""
+
+        return list(csv.reader(self._splitter.feed(
+            self._decoder.decode(data))))
+
+    def close(self) -> list:
+        """End of the stream; returns the remaining rows."""
+
+        records = self._splitter.feed(self._decoder.decode(b'', final=True))
+        records += self._splitter.close()
+
+        return list(csv.reader(records))
+
+#------------------------------------------------------------------------------
+
+def iter_rows(stream, encoding: str = 'utf-8', chunk_size: int = CHUNK_SIZE):
+    """Yield the CSV rows of a binary stream (file, pipe), reading it in
+    chunks."""
+
+    decoder = CsvStreamDecoder(encoding)
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield from decoder.feed(chunk)
+
+    yield from decoder.close()
+
+#==============================================================================
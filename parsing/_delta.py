@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Dirty tracking of a table object, and delta export of its changes.
+
+A DirtyTracker wraps the rules of a table object so that assigning a
+field (rule['Status'] = '0'), adding a rule (add_rule) or deleting one
+(delete_rule) is recorded.  The changes can then be written back as
+- a CSV patch: the header with two leading columns Operation (UPDATE,
+  INSERT or DELETE) and KeyID (ID of the record to update or delete),
+  then one row per changed rule;
+- parameterized UPDATE/INSERT/DELETE statements keyed by ID, updating
+  only the fields that were assigned.
+Only the changed rules are exported, so this takes time proportional to
+the changes, not to the table.
+
+Changes made in place inside a field (e.g. to a constituent of a
+structure) are not seen: assign the field, or call mark().  Note that
+with memoization (see _structure_memo) parsed structures are shared and
+read-only anyway (see _structure_memo.writable, which assigns the field).
+
+Usage:
+    tracker = _delta.DirtyTracker(table_object)
+    table_object._rules[5]['Status'] = '0'
+    tracker.add_rule(new_rule)
+    for sql, params in tracker.sql_statements('Rules_Transfer'):
+        cursor.execute(sql, params)
+    tracker.clear()
+
+============================================================================"""
+
+import csv
+
+import _registry
+from _incremental import (rules_in_record_order, set_rules_in_record_order,
+                          touch)
+
+#==============================================================================
+
+class TrackedRule(dict):
+    """
+    Rule (dict) that reports field assignments to its tracker.
+    """
+
+    __slots__ = ('_tracker', '_key_id')
+
+    def __setitem__(self, fieldname, value):
+        dict.__setitem__(self, fieldname, value)
+        if self._tracker is not None:
+            self._tracker.mark(self, fieldname)
+
+    def __delitem__(self, fieldname):
+        raise TypeError('Error: cannot delete a field of a rule.')
+
+    pop = popitem = clear = __delitem__
+
+    def update(self, *args, **kwargs):
+        for fieldname, value in dict(*args, **kwargs).items():
+            self[fieldname] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, fieldname, value=None):
+        if fieldname not in self:
+            self[fieldname] = value
+        return self[fieldname]
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+#==============================================================================
+
+class DirtyTracker:
+    """
+    Record the changes made to the rules of a table object.
+    """
+
+    def __init__(self, table_object):
+        """Constructor for class: start tracking (the rules of the object
+        are replaced by TrackedRule copies)."""
+
+        assert table_object._is_set, (
+            'Error: cannot track because table has not been set.')
+
+        self.table_object = table_object
+
+        rules = table_object._rules
+        for k, rule in enumerate(rules):
+            rules[k] = self._track(rule, rule['ID'])
+
+        self._reset()
+
+#------------------------------------------------------------------------------
+
+    def _track(self, rule: dict, key_id) -> TrackedRule:
+        """TrackedRule copy of a rule; key_id is the ID of its record in
+        the database (None for a new rule)."""
+
+        tracked = TrackedRule(rule)
+        tracked._tracker = self
+        tracked._key_id = key_id
+        return tracked
+
+    def _reset(self):
+        # Existing rules: id(rule) -> (rule, assigned fieldnames).
+        self._updated = {}
+        # New rules: id(rule) -> rule.
+        self._inserted = {}
+        # IDs of deleted records.
+        self._deleted = []
+
+#------------------------------------------------------------------------------
+
+    def mark(self, rule: TrackedRule, fieldname: str = None):
+        """Record a change to a rule (fieldname None: all fields)."""
+
+        touch(self.table_object)
+
+        if rule._key_id is None:
+            return # new rule: inserted whole
+
+        _, fieldnames = self._updated.setdefault(id(rule), (rule, set()))
+        fieldnames.add(fieldname)
+
+#------------------------------------------------------------------------------
+
+    def add_rule(self, rule: dict) -> TrackedRule:
+        """Add a new (parsed) rule at the end of the table; returns the
+        tracked rule, which is in the table."""
+
+        tracked = self._track(rule, None)
+        self._inserted[id(tracked)] = tracked
+
+        obj = self.table_object
+        if getattr(obj, '_iperm', None) is None:
+            obj._rules.append(tracked)
+            obj._num_rules = len(obj._rules)
+        else:
+            set_rules_in_record_order(
+                obj, rules_in_record_order(obj) + [tracked])
+        touch(obj)
+
+        return tracked
+
+#------------------------------------------------------------------------------
+
+    def delete_rule(self, rule: TrackedRule):
+        """Delete a rule (one of the rules of the table)."""
+
+        obj = self.table_object
+        k = next(k for k, r in enumerate(obj._rules) if r is rule)
+
+        if getattr(obj, '_iperm', None) is None:
+            del obj._rules[k]
+            obj._num_rules = len(obj._rules)
+        else:
+            set_rules_in_record_order(obj,
+                [r for r in rules_in_record_order(obj) if r is not rule])
+        touch(obj)
+
+        rule._tracker = None
+        if rule._key_id is None:
+            del self._inserted[id(rule)]
+        else:
+            self._updated.pop(id(rule), None)
+            self._deleted.append(rule._key_id)
+
+#------------------------------------------------------------------------------
+
+    def is_dirty(self) -> bool:
+        """Whether anything changed since tracking started (or clear)."""
+
+        return bool(self._updated or self._inserted or self._deleted)
+
+    def clear(self):
+        """Forget the changes (once they are written back)."""
+
+        for rule, _ in self._updated.values():
+            rule._key_id = rule['ID']
+        for rule in self._inserted.values():
+            rule._key_id = rule['ID']
+
+        self._reset()
+
+#------------------------------------------------------------------------------
+
+    def _export_rows(self, rules: list) -> list:
+        """Rows of some rules (header first), by the export_table of an
+        object of the same class holding only these rules."""
+
+        obj = self.table_object
+        partial = type(obj)()
+        vars(partial).update(vars(obj))
+        set_rules_in_record_order(partial, list(rules))
+
+        return partial.export_table()
+
+#------------------------------------------------------------------------------
+
+    def delta(self) -> dict:
+        """The changes, as rows of the table:
+        {'header': [...], 'updated': [(ID, row, fieldnames), ...],
+         'inserted': [row, ...], 'deleted': [ID, ...]}
+        where fieldnames are the assigned fields (None: all of them)."""
+
+        updated = list(self._updated.values())
+        # (Added at the end of the table, in this order.)
+        inserted = list(self._inserted.values())
+
+        rows = self._export_rows([rule for rule, _ in updated] + inserted)
+        header = rows[0]
+
+        return {
+            'header': header,
+            'updated': [(rule._key_id, row,
+                         None if None in fieldnames else [
+                             f for f in header if f in fieldnames])
+                        for (rule, fieldnames), row in zip(
+                            updated, rows[1:1+len(updated)])],
+            'inserted': rows[1+len(updated):],
+            'deleted': list(self._deleted),
+        }
+
+#------------------------------------------------------------------------------
+
+    def write_csv_patch(self, fp):
+        """Write the changes as a CSV patch to a text file."""
+
+        delta = self.delta()
+        header = delta['header']
+
+        writer = csv.writer(fp)
+        writer.writerow(['Operation', 'KeyID'] + header)
+        for key_id, row, _ in delta['updated']:
+            writer.writerow(['UPDATE', key_id] + row)
+        for row in delta['inserted']:
+            writer.writerow(['INSERT', ''] + row)
+        for key_id in delta['deleted']:
+            writer.writerow(['DELETE', key_id] + [''] * len(header))
+
+#------------------------------------------------------------------------------
+
+    def sql_statements(self, table_name: str) -> list:
+        """The changes as (sql, params) pairs, with "?" parameters, for the
+        table of the database (e.g. "Ontology_Nouns" is table Nouns of
+        Ontology.mdb)."""
+
+        delta = self.delta()
+        header = delta['header']
+        table = f'[{_registry.mdb_file_table_name(table_name)}]'
+
+        out = []
+
+        for key_id, row, fieldnames in delta['updated']:
+            fieldnames = header if fieldnames is None else fieldnames
+            values = dict(zip(header, row))
+            out.append((
+                f'UPDATE {table} SET '
+                + ', '.join(f'[{f}] = ?' for f in fieldnames)
+                + ' WHERE [ID] = ?',
+                [values[f] for f in fieldnames] + [key_id]))
+
+        for row in delta['inserted']:
+            out.append((
+                f'INSERT INTO {table} ('
+                + ', '.join(f'[{f}]' for f in header) + ') VALUES ('
+                + ', '.join('?' * len(header)) + ')',
+                row))
+
+        for key_id in delta['deleted']:
+            out.append((f'DELETE FROM {table} WHERE [ID] = ?', [key_id]))
+
+        return out
+
+#==============================================================================
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Resolved source features of the Ontology concepts, precomputed.
+
+For each concept of the Ontology concept tables (Ontology_Nouns, ...), a
+record joins
+- the concept's own fields that matter for analysis (Roots, Level,
+  Categories, ParentID);
+- its place in the category hierarchy of its table (e.g.
+  Ontology_NounHierarchy): the groups from the root down to the group
+  given by its ParentID, following ParentID up the hierarchy;
+- the source features of its syntactic category (Ontology_Features_Source),
+  in table order, as FeatureName -> FeatureValues (pairs of value name
+  and value code).
+Once built, resolving a concept is a single dict probe:
+
+    closure = _feature_closure.get_closure(context)
+    record = closure['Ontology_Nouns', concept_id]
+    record['features']['Number']
+
+Note the features are not inherited along the hierarchy: Features_Source
+defines features per syntactic category only (it has no column relating
+them to groups or concepts), so the features of a concept are those of
+its category, one read-only mapping shared by all the concepts of the
+category.  The record joins them with the hierarchy path, which is what
+needs the repeated lookups.  Pronouns take the features of nouns (there
+is no pronoun syntactic category in Features_Source).
+
+Records and their parts are read-only (tuples and read-only mappings).
+
+get_closure caches the closure by the generations of its input tables
+(see _incremental.generation): checking them costs a few dict probes, and
+they change on import_table, set_rules_in_record_order and the edits
+made through _delta.DirtyTracker.  Code that edits the input tables in
+place otherwise must call _incremental.touch on them.
+
+============================================================================"""
+
+from collections import OrderedDict
+from types import MappingProxyType
+
+import _utils
+from _incremental import rules_in_record_order, generation
+
+# Concept table -> (hierarchy table, syntactic category).
+CONCEPT_TABLES = {
+    'Ontology_Nouns': ('Ontology_NounHierarchy', _utils.SYNCATS['noun']),
+    'Ontology_Verbs': ('Ontology_VerbHierarchy', _utils.SYNCATS['verb']),
+    'Ontology_Adjectives':
+        ('Ontology_AdjectiveHierarchy', _utils.SYNCATS['adjective']),
+    'Ontology_Adverbs':
+        ('Ontology_AdverbHierarchy', _utils.SYNCATS['adverb']),
+    'Ontology_Adpositions':
+        ('Ontology_AdpositionHierarchy', _utils.SYNCATS['adposition']),
+    'Ontology_Conjunctions':
+        ('Ontology_ConjunctionHierarchy', _utils.SYNCATS['conjunction']),
+    'Ontology_Particles':
+        ('Ontology_ParticleHierarchy', _utils.SYNCATS['particle']),
+    'Ontology_Pronouns':
+        ('Ontology_PronounHierarchy', _utils.SYNCATS['noun']),
+}
+
+FEATURES_TABLE = 'Ontology_Features_Source'
+
+# Closures kept by get_closure (most recently used last).
+CACHE_SIZE = 4
+_closures = OrderedDict()
+
+#==============================================================================
+
+def _input_tables(tables) -> list:
+    """Names of the input tables present in tables."""
+
+    out = []
+    for table_name, (hierarchy_name, _) in CONCEPT_TABLES.items():
+        if table_name in tables:
+            out.append(table_name)
+            if hierarchy_name in tables:
+                out.append(hierarchy_name)
+    if FEATURES_TABLE in tables:
+        out.append(FEATURES_TABLE)
+
+    return out
+
+#------------------------------------------------------------------------------
+
+def version(tables) -> tuple:
+    """The generations of the input tables the closure is built from (see
+    _incremental.generation).
+
+    tables maps table names to table objects (e.g. an OntologyContext).
+    """
+
+    return tuple((table_name, generation(tables[table_name]))
+                 for table_name in _input_tables(tables))
+
+#==============================================================================
+
+class FeatureClosure:
+    """
+    Resolved feature records of the concepts, by (table name, concept ID).
+    """
+
+    def __init__(self, records: dict, version_: tuple = None):
+        """Constructor for class (see build)."""
+
+        self._records = records
+        # Version of the inputs (see version).
+        self.version = version_
+
+    def __getitem__(self, key: tuple) -> MappingProxyType:
+        return self._records[key]
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, table_name: str, concept_id: str):
+        """The record of a concept (None if none)."""
+
+        return self._records.get((table_name, concept_id))
+
+#------------------------------------------------------------------------------
+
+def _features_by_syncat(features_object) -> dict:
+    """Syntactic category -> read-only FeatureName -> FeatureValues."""
+
+    by_syncat = {}
+    for rule in rules_in_record_order(features_object):
+        features = by_syncat.setdefault(rule['SyntacticCategory'], {})
+        features.setdefault(rule['FeatureName'],
+                            tuple(tuple(value)
+                                  for value in rule['FeatureValues']))
+
+    return {syncat: MappingProxyType(features)
+            for syncat, features in by_syncat.items()}
+
+#------------------------------------------------------------------------------
+
+def _group_paths(hierarchy_object) -> dict:
+    """Group ID -> (group IDs, group names) from the root down to it."""
+
+    groups = {rule['ID']: rule for rule in hierarchy_object._rules}
+    paths = {}
+
+    for group_id in groups:
+        # Walk up to a group already resolved (or to the root, to a missing
+        # parent, or around a cycle), then resolve the groups on the way.
+        chain = []
+        seen = set()
+        while (group_id in groups and group_id not in paths
+               and group_id not in seen):
+            seen.add(group_id)
+            chain.append(group_id)
+            group_id = groups[group_id]['ParentID']
+        ids, names = paths.get(group_id, ((), ()))
+        for group_id in reversed(chain):
+            ids = ids + (group_id,)
+            names = names + (groups[group_id]['GroupName'],)
+            paths[group_id] = (ids, names)
+
+    return paths
+
+#------------------------------------------------------------------------------
+
+def build(tables) -> FeatureClosure:
+    """Build the closure of the concept tables present in tables (a
+    mapping of table names to table objects, e.g. an OntologyContext)."""
+
+    features = (_features_by_syncat(tables[FEATURES_TABLE])
+                if FEATURES_TABLE in tables else {})
+    no_features = MappingProxyType({})
+
+    records = {}
+
+    for table_name, (hierarchy_name, syncat) in CONCEPT_TABLES.items():
+        if table_name not in tables:
+            continue
+
+        paths = (_group_paths(tables[hierarchy_name])
+                 if hierarchy_name in tables else {})
+        syncat_features = features.get(syncat, no_features)
+
+        for rule in tables[table_name]._rules:
+            group_ids, groups = paths.get(rule['ParentID'], ((), ()))
+            records[table_name, rule['ID']] = MappingProxyType({
+                'ID': rule['ID'],
+                'Roots': rule['Roots'],
+                'Level': rule['Level'],
+                'Categories': rule['Categories'],
+                'ParentID': rule['ParentID'],
+                'SyntacticCategory': syncat,
+                'group_ids': group_ids,
+                'groups': groups,
+                'features': syncat_features,
+            })
+
+    return FeatureClosure(records, version(tables))
+
+#==============================================================================
+
+def get_closure(tables) -> FeatureClosure:
+    """The closure of tables, built on first use and again only when the
+    input tables change (see version)."""
+
+    key = version(tables)
+
+    closure = _closures.get(key)
+    if closure is None:
+        closure = _closures[key] = build(tables)
+        if len(_closures) > CACHE_SIZE:
+            _closures.popitem(last=False)
+    else:
+        _closures.move_to_end(key)
+
+    return closure
+
+#------------------------------------------------------------------------------
+
+def clear_cache():
+    """Forget the closures built by get_closure."""
+
+    _closures.clear()
+
+#==============================================================================
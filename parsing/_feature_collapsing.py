@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Compiled feature collapsing for the rules of a Rules_FeatureCollapsing
+table.
+
+A feature string is a comma-separated list of slots, one per feature of
+the syntactic category (in the order of the features table), each slot
+holding single-character feature values.  A collapsing rule replaces, in
+one slot, each value being collapsed by the value it is collapsed to.
+
+The rules are compiled into one str.translate table per (syncat, slot).
+If the values collapsed in a syncat are not used by any other slot of that
+syncat, the whole string is translated at once instead of slot by slot.
+
+The result of each distinct (syncat, feature string) of collapse_column is
+cached, keeping at most cache_size strings (least recently used first
+out); clear_cache() empties it.
+
+============================================================================"""
+
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = 4096
+
+#------------------------------------------------------------------------------
+
+def feature_slots(features_table) -> dict:
+    """Map (syncat, FeatureName) to the slot index of the feature.
+
+    The features table is an imported FeaturesSource, FeaturesTarget or
+    OntologyFeaturesSource object; slots are numbered in record order
+    within each syncat.
+    """
+
+    assert features_table._is_set, (
+        'Error: features table has not been set.')
+
+    out = {}
+    counts = {}
+
+    for rule in features_table._rules:
+        syncat = rule['SyntacticCategory']
+        slot = counts.get(syncat, 0)
+        counts[syncat] = slot + 1
+        out[(syncat, rule['FeatureName'])] = slot
+
+    return out
+
+#------------------------------------------------------------------------------
+
+def feature_alphabets(features_table) -> dict:
+    """Map (syncat, slot) to the set of value characters of the feature."""
+
+    slots = feature_slots(features_table)
+
+    out = {}
+
+    for rule in features_table._rules:
+        key = (rule['SyntacticCategory'],
+               slots[(rule['SyntacticCategory'], rule['FeatureName'])])
+        out[key] = {f[-1] for f in rule['FeatureValues'] if f != []}
+
+    return out
+
+#==============================================================================
+
+class FeatureCollapser:
+    """
+    Translation tables compiled from an imported RulesFeatureCollapsing
+    object.
+
+    -----------------------------------------------------------------------
+    Notes
+
+    Rules are applied in record order; the pairs within one rule are
+    applied simultaneously.
+
+    Rules for a feature not found in the features table are not applied;
+    they are listed in self.unresolved as (syncat, FeatureName).
+
+    -----------------------------------------------------------------------
+    """
+
+    def __init__(self, collapsing_table, features_table,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """Compile the rules, using the features table for slot numbers;
+        cache_size bounds the cache of collapse_column (0 disables it)."""
+
+        assert collapsing_table._is_set, (
+            'Error: cannot compile because table has not been set.')
+
+        slots = feature_slots(features_table)
+        alphabets = feature_alphabets(features_table)
+
+        self.unresolved = []
+
+        # syncat -> slot -> {from: to}, composed in rule order.
+        mappings = {}
+
+        for rule in collapsing_table._rules:
+
+            key = (rule['SyntacticCategory'], rule['FeatureName'])
+            if key not in slots:
+                self.unresolved.append(key)
+                continue
+
+            mapping = mappings.setdefault(key[0], {}).setdefault(
+                slots[key], {})
+
+            new = {p[1]: p[0] for p in rule['Rules']}
+            for c in set(mapping) | set(new):
+                c2 = mapping.get(c, c)
+                mapping[c] = new.get(c2, c2)
+
+        # syncat -> slot -> translate table.
+        self._tables = {}
+        # syncat -> translate table for the whole string, if safe.
+        self._whole = {}
+
+        for syncat, slot_mappings in mappings.items():
+
+            self._tables[syncat] = {
+                slot: str.maketrans({c: c2 for c, c2 in m.items() if c != c2})
+                for slot, m in slot_mappings.items()}
+
+            whole = {}
+            for slot, table in self._tables[syncat].items():
+                for c, c2 in table.items():
+                    # Unsafe if the value also belongs to another slot.
+                    if any(chr(c) in alphabet for (s, i), alphabet in
+                           alphabets.items() if s == syncat and i != slot):
+                        whole = None
+                        break
+                    whole[c] = c2
+                if whole is None:
+                    break
+
+            self._whole[syncat] = whole
+
+        self._cache = OrderedDict() # (syncat, features) -> result (LRU)
+        self._cache_size = cache_size
+
+#------------------------------------------------------------------------------
+
+    def collapse(self, syncat: str, features: str) -> str:
+        """Collapse the feature values of one feature string."""
+
+        whole = self._whole.get(syncat)
+        if whole is not None:
+            return features.translate(whole)
+
+        tables = self._tables.get(syncat)
+        if not tables:
+            return features
+
+        slots = features.split(',')
+        for slot, table in tables.items():
+            if slot < len(slots):
+                slots[slot] = slots[slot].translate(table)
+
+        return ','.join(slots)
+
+#------------------------------------------------------------------------------
+
+    def collapse_column(self, syncat: str, column) -> list:
+        """Collapse a whole column of feature strings of one syncat.
+
+        Each distinct string is collapsed only once per call, or not at
+        all if it is cached.
+        """
+
+        cache = self._cache
+        collapse = self.collapse
+        found = {} # features -> result, for this column
+
+        out = []
+        for features in column:
+            result = found.get(features)
+            if result is None:
+                key = (syncat, features)
+                result = cache.get(key)
+                if result is None:
+                    result = collapse(syncat, features)
+                    if self._cache_size > 0:
+                        cache[key] = result
+                        if len(cache) > self._cache_size:
+                            cache.popitem(last=False)
+                else:
+                    cache.move_to_end(key)
+                found[features] = result
+            out.append(result)
+
+        return out
+
+#------------------------------------------------------------------------------
+
+    def clear_cache(self):
+        """Empty the cache of collapse_column."""
+
+        self._cache.clear()
+
+#==============================================================================
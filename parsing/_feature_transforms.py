@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Compiled feature transforms for the rules of a Rules_SpeechStyles or
+Rules_TenseAspectMood table.
+
+A clause is given as the tuple of its feature strings: verb, verb phrase
+and clause features, plus (for speech styles) the source text.  A rule's
+InputFeatures has the same fields; in each comma-separated slot it lists
+the feature value characters that match (an empty slot matches anything),
+and a non-empty source text must match exactly.
+
+Each clause is encoded as a bit vector (a Python int) with one bit per
+(field, slot, value) used by any rule, plus one "other" bit per (field,
+slot) for values no rule mentions.  Each rule is compiled into the mask of
+the bits it does not accept, so a rule matches a clause iff
+clause & mask == 0.  The first matching active rule in record order is
+applied.
+
+The match of each distinct clause is cached, keeping at most cache_size
+clauses (least recently used first out); clear_cache() empties it.
+
+============================================================================"""
+
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = 4096
+
+_MISSING = object()
+
+#==============================================================================
+
+class FeatureTransformEngine:
+    """
+    Match masks and rewrite operations compiled from an imported
+    RulesSpeechStyles or RulesTenseAspectMood object.
+
+    -----------------------------------------------------------------------
+    Notes
+
+    The rewrite prepends the rule's OutputFeatures to the verb features
+    (cf. the notes in RulesSpeechStyles).
+    ISSUE: unclear whether the original code does more than this.
+
+    -----------------------------------------------------------------------
+    """
+
+    # Field holding the source text (matched as a whole, not by slot).
+    SOURCE_TEXT_FIELD = 3
+
+    def __init__(self, table_object, cache_size: int = DEFAULT_CACHE_SIZE):
+        """Compile the active rules of a table; cache_size bounds the cache
+        of clause matches (0 disables it)."""
+
+        assert table_object._is_set, (
+            'Error: cannot compile because table has not been set.')
+
+        rules = [(i, rule) for i, rule in enumerate(table_object._rules)
+                 if rule['Status'] == '1']
+
+        # First pass: collect the values used per (field, slot), and give
+        # each one a bit; bit 0 of each (field, slot) is "other".
+
+        self._bits = {} # (field, slot) -> {value: bit}
+        self._other = {} # (field, slot) -> bit
+        num_bits = 0
+
+        for _, rule in rules:
+            for key, values in self._slot_values(rule['InputFeatures']):
+                if key not in self._bits:
+                    self._bits[key] = {}
+                    self._other[key] = 1 << num_bits
+                    num_bits += 1
+                for value in values:
+                    if value not in self._bits[key]:
+                        self._bits[key][value] = 1 << num_bits
+                        num_bits += 1
+
+        # Second pass: for each rule, the mask of the bits not accepted.
+
+        self._positions = []
+        self._masks = []
+        self._outputs = []
+
+        for i, rule in rules:
+            mask = 0
+            for key, values in self._slot_values(rule['InputFeatures']):
+                mask |= self._other[key]
+                for value, bit in self._bits[key].items():
+                    if value not in values:
+                        mask |= bit
+            self._positions.append(i)
+            self._masks.append(mask)
+            self._outputs.append(','.join(rule['OutputFeatures']))
+
+        # Slots to look at when encoding a clause.
+        self._slots = sorted(self._bits)
+
+        self._cache = OrderedDict() # clause -> position (LRU)
+        self._cache_size = cache_size
+
+#------------------------------------------------------------------------------
+
+    def _slot_values(self, fields: list):
+        """Yield ((field, slot), accepted values) for constrained slots."""
+
+        for field, s in enumerate(fields):
+            if field == self.SOURCE_TEXT_FIELD:
+                if s != '':
+                    yield (field, 0), {s}
+                continue
+            for slot, values in enumerate(s.split(',')):
+                if values != '':
+                    yield (field, slot), set(values)
+
+#------------------------------------------------------------------------------
+
+    def encode(self, clause: tuple) -> int:
+        """Encode a clause's feature strings as a bit vector."""
+
+        split = {}
+        out = 0
+
+        for key in self._slots:
+            field, slot = key
+            if field >= len(clause):
+                out |= self._other[key]
+                continue
+            if field == self.SOURCE_TEXT_FIELD:
+                values = [clause[field]]
+            else:
+                if field not in split:
+                    split[field] = clause[field].split(',')
+                values = split[field][slot] if (
+                    slot < len(split[field])) else ''
+            bits = self._bits[key]
+            if values == '':
+                out |= self._other[key]
+            for value in values:
+                out |= bits.get(value, self._other[key])
+
+        return out
+
+#------------------------------------------------------------------------------
+
+    def match_batch(self, clauses) -> list:
+        """Position (in the table) of the first matching rule per clause,
+        or None.
+
+        Each distinct clause is encoded once, and each rule is tested
+        against all clauses not yet matched (nor cached).
+        """
+
+        clauses = [tuple(c) for c in clauses]
+
+        cache = self._cache
+        found = {} # clause -> position, for this batch
+        pending = {}
+        for clause in clauses:
+            if clause in found or clause in pending:
+                continue
+            position = cache.get(clause, _MISSING)
+            if position is _MISSING:
+                pending[clause] = self.encode(clause)
+            else:
+                cache.move_to_end(clause)
+                found[clause] = position
+
+        new = dict.fromkeys(pending)
+        for position, mask in zip(self._positions, self._masks):
+            if not pending:
+                break
+            matched = [c for c, code in pending.items() if code & mask == 0]
+            for clause in matched:
+                new[clause] = position
+                del pending[clause]
+        found.update(new)
+
+        if self._cache_size > 0:
+            cache.update(new)
+            while len(cache) > self._cache_size:
+                cache.popitem(last=False)
+
+        return [found[clause] for clause in clauses]
+
+#------------------------------------------------------------------------------
+
+    def clear_cache(self):
+        """Empty the cache of clause matches."""
+
+        self._cache.clear()
+
+#------------------------------------------------------------------------------
+
+    def apply_batch(self, clauses) -> list:
+        """Apply the rules to a batch of clauses; returns the clauses with
+        rewritten verb features."""
+
+        clauses = [tuple(c) for c in clauses]
+        positions = self.match_batch(clauses)
+
+        output_of = dict(zip(self._positions, self._outputs))
+
+        out = []
+
+        for clause, position in zip(clauses, positions):
+            output = '' if position is None else output_of[position]
+            if output == '':
+                out.append(clause)
+                continue
+            verb = clause[0]
+            verb = output + ',' + verb if verb != '' else output
+            out.append((verb,) + clause[1:])
+
+        return out
+
+#==============================================================================
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Engine to apply the rules of a Rules_FindReplace table to generated text.
+
+All active find/replace rules, including the pairs of the punctuation
+tables, are compiled into a single Aho-Corasick automaton, so the text is
+scanned once no matter how many rules there are.  Matches are selected
+leftmost-longest: at each position of the text the longest matching find
+string wins, and if several rules have the same find string, the earliest
+rule (in record order) wins.  The replaced text is never rescanned.
+
+Text can be given all at once (apply) or as a stream of chunks (feed,
+flush); output is released as soon as no longer match could change it.
+
+============================================================================"""
+
+#------------------------------------------------------------------------------
+
+def parse_find_replace_strings(in_: str) -> list:
+    """Split a standard rule's Input or Output field into its strings.
+
+    The field is a "|"-delimited list of strings.  A string preceded by
+    "||" instead of "|" is "bleeding" text.  Returns a list of
+    [string, is_bleeding] pairs.
+    """
+
+    out = []
+
+    is_bleeding = False
+
+    for s in in_.split('|'):
+        # An empty string between delimiters is the marker for "||".
+        if s == '':
+            is_bleeding = True
+            continue
+        out.append([s, is_bleeding])
+        is_bleeding = False
+
+    return out
+
+#------------------------------------------------------------------------------
+
+def find_replace_patterns(table_object) -> list:
+    """Collect the (find, replace, is_bleeding) patterns of a table.
+
+    The table is a RulesFindReplace object which has been imported.
+    Only active rules are used.  The list is in priority order: rule order,
+    and within a standard rule, right to left (the order in which the
+    original code scans the strings).
+    """
+
+    assert table_object._is_set, (
+        'Error: cannot compile because table has not been set.')
+
+    out = []
+
+    for rule in table_object._rules:
+
+        if rule['Status'] != '1':
+            continue
+
+        is_punctuation = rule['RuleType'] == '1'
+
+        if is_punctuation:
+
+            # Punctuation table: Input String ~!~ Output String ~!~ Comment.
+            for row in rule['PunctuationTable']:
+                if len(row) >= 2 and row[0] != '':
+                    out.append((row[0], row[1], False))
+
+            # "Delete Spaces Before" and "Delete Spaces After" characters.
+            before, after = rule['Input'], rule['Output']
+            for c in before:
+                if c in after:
+                    out.append((' ' + c + ' ', c, False))
+            for c in before:
+                out.append((' ' + c, c, False))
+            for c in after:
+                out.append((c + ' ', c, False))
+
+        else:
+
+            finds = parse_find_replace_strings(rule['Input'])
+            replaces = parse_find_replace_strings(rule['Output'])
+            replaces += [['', False]] * (len(finds) - len(replaces))
+
+            for (find, is_bleeding), (replace, _) in reversed(
+                list(zip(finds, replaces))):
+                out.append((find, replace, is_bleeding))
+
+    return out
+
+#==============================================================================
+
+class FindReplaceEngine:
+    """
+    Aho-Corasick automaton over the find strings of a Rules_FindReplace
+    table.
+
+    -----------------------------------------------------------------------
+    Notes
+
+    ISSUE: "bleeding" strings (preceded by "||") stop the scan of the
+    original code for that rule; in a single pass over all rules there is
+    no such scan, so they are matched like any other string.  The flag is
+    kept in self.patterns for callers that need it.
+
+    -----------------------------------------------------------------------
+    """
+
+    def __init__(self, patterns: list):
+        """Build the automaton from (find, replace, is_bleeding) patterns.
+
+        Earlier patterns take priority over later ones with the same find
+        string.
+        """
+
+        self.patterns = []
+
+        # Trie: per state, the transitions and the pattern ending there.
+        goto = [{}]
+        terminal = [None]
+
+        for find, replace, is_bleeding in patterns:
+            if find == '':
+                continue
+            state = 0
+            for c in find:
+                if c not in goto[state]:
+                    goto[state][c] = len(goto)
+                    goto.append({})
+                    terminal.append(None)
+                state = goto[state][c]
+            # Keep only the first (highest priority) rule for a find string.
+            if terminal[state] is None:
+                terminal[state] = len(self.patterns)
+                self.patterns.append((find, replace, is_bleeding))
+
+        # Failure links, computed breadth first.
+        fail = [0] * len(goto)
+        # Patterns ending at each state, longest first.
+        outputs = [()] * len(goto)
+
+        queue = []
+        for state in goto[0].values():
+            queue.append(state)
+        for state in queue:
+            for c, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f != 0 and c not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f][c] if c in goto[f] else 0
+            outputs[state] = ((terminal[state],) if terminal[state] is not None
+                              else ()) + outputs[fail[state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self._lengths = [len(p[0]) for p in self.patterns]
+        self._max_len = max(self._lengths, default=1)
+
+        self.reset()
+
+#------------------------------------------------------------------------------
+
+    @classmethod
+    def from_table(cls, table_object):
+        """Build the engine from an imported RulesFindReplace object."""
+
+        return cls(find_replace_patterns(table_object))
+
+#------------------------------------------------------------------------------
+
+    def reset(self):
+        """Start a new stream of text."""
+
+        self._state = 0
+        # Absolute offsets: characters consumed, and first undecided one.
+        self._pos = 0
+        self._cur = 0
+        # Pending text starting at offset self._cur.
+        self._pending = []
+        # Best match per start offset: pattern number.
+        self._best = {}
+
+#------------------------------------------------------------------------------
+
+    def feed(self, text: str) -> str:
+        """Consume a chunk of text, return the output that is final."""
+
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        lengths, best = self._lengths, self._best
+        state, pos = self._state, self._pos
+
+        for c in text:
+            while state != 0 and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            pos += 1
+            for k in outputs[state]:
+                start = pos - lengths[k]
+                # Longest first; on ties the lower pattern number wins.
+                k_best = best.get(start)
+                if k_best is None or lengths[k] > lengths[k_best] or (
+                    lengths[k] == lengths[k_best] and k < k_best):
+                    best[start] = k
+
+        self._state, self._pos = state, pos
+        self._pending.append(text)
+
+        return self._release(pos - self._max_len + 1)
+
+#------------------------------------------------------------------------------
+
+    def flush(self) -> str:
+        """Return the remaining output at the end of the stream."""
+
+        out = self._release(self._pos)
+        self.reset()
+        return out
+
+#------------------------------------------------------------------------------
+
+    def apply(self, text: str) -> str:
+        """Apply all rules to a complete text."""
+
+        self.reset()
+        return self.feed(text) + self.flush()
+
+#------------------------------------------------------------------------------
+
+    def _release(self, limit: int) -> str:
+        """Decide the output for all positions before offset limit."""
+
+        cur = self._cur
+        if limit <= cur:
+            return ''
+
+        pending = ''.join(self._pending)
+        best, lengths, patterns = self._best, self._lengths, self.patterns
+
+        out = []
+        i = 0 # index into pending, corresponding to offset cur
+        while cur < limit:
+            k = best.pop(cur, None)
+            if k is None:
+                out.append(pending[i])
+                cur += 1
+                i += 1
+            else:
+                out.append(patterns[k][1])
+                cur += lengths[k]
+                i += lengths[k]
+
+        # Forget matches that start inside text already replaced.
+        for start in [s for s in best if s < cur]:
+            del best[start]
+
+        self._cur = cur
+        self._pending = [pending[i:]]
+
+        return ''.join(out)
+
+#==============================================================================
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Index of the named lexical forms of the lexicon entries of a language.
+
+LexicalFormNames gives, per syntactic category, the user-defined form
+names (FormName) and the lexicon field holding each form (FieldName, e.g.
+"Form 1"; a bare number n stands for field "Form n").  The lexicon tables
+(Nouns, Verbs, ...) hold the forms of each entry (EntryID) in these
+fields.  The index joins both, once, so that finding the named form of an
+entry, e.g. for the FormName/BaseForm of Lexical Form Selection spellout
+rules, is a single dict probe:
+
+    index = _form_index.build(tables['English'])
+    index.get('Nouns', entry_id, form_name)
+
+Keys are (lexicon table name, EntryID, FormName): entry IDs are numbered
+per lexicon table, and the syntactic category does not tell Pronouns from
+Nouns.  Entries whose form field is empty are not indexed (get then
+returns the default, e.g. for a fallback to Roots).  An EntryID used
+twice in a lexicon table raises ValueError.  Pronouns have the form names
+of nouns (there is no pronoun syntactic category in LexicalFormNames).
+
+============================================================================"""
+
+import _utils
+from _incremental import rules_in_record_order
+
+# Lexicon table -> syntactic category (of its form names).
+LEXICON_TABLES = {
+    'Nouns': _utils.SYNCATS['noun'],
+    'Verbs': _utils.SYNCATS['verb'],
+    'Adjectives': _utils.SYNCATS['adjective'],
+    'Adverbs': _utils.SYNCATS['adverb'],
+    'Adpositions': _utils.SYNCATS['adposition'],
+    'Conjunctions': _utils.SYNCATS['conjunction'],
+    'Particles': _utils.SYNCATS['particle'],
+    'Pronouns': _utils.SYNCATS['noun'],
+}
+
+FORM_NAMES_TABLE = 'LexicalFormNames'
+
+#==============================================================================
+
+class FormIndex:
+    """
+    Form strings by (lexicon table name, EntryID, FormName).
+    """
+
+    def __init__(self, forms: dict, form_fields: dict):
+        """Constructor for class (see build)."""
+
+        self._forms = forms
+        # (syntactic category, FormName) -> lexicon field name.
+        self.form_fields = form_fields
+
+    def __getitem__(self, key: tuple) -> str:
+        return self._forms[key]
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._forms
+
+    def __len__(self) -> int:
+        return len(self._forms)
+
+    def get(self, table_name: str, entry_id: str, form_name: str,
+            default: str = None) -> str:
+        """The form of an entry of a lexicon table (default if none)."""
+
+        return self._forms.get((table_name, entry_id, form_name), default)
+
+#------------------------------------------------------------------------------
+
+def form_fields(form_names_object) -> dict:
+    """(syntactic category, FormName) -> FieldName, from a LexicalFormNames
+    object (the first definition of a name is used)."""
+
+    out = {}
+    for rule in rules_in_record_order(form_names_object):
+        out.setdefault((rule['SyntacticCategory'], rule['FormName']),
+                       rule['FieldName'])
+
+    return out
+
+#------------------------------------------------------------------------------
+
+def _lexicon_fieldname(fieldname: str, fieldnames) -> str:
+    """The lexicon field for a FieldName of LexicalFormNames (None if the
+    table has no such field)."""
+
+    if fieldname in fieldnames:
+        return fieldname
+
+    if fieldname.isdigit() and f'Form {fieldname}' in fieldnames:
+        return f'Form {fieldname}'
+
+    return None
+
+#------------------------------------------------------------------------------
+
+def build(tables: dict) -> FormIndex:
+    """Build the index of a language from its tables given as {table_name:
+    table object} (those present of LexicalFormNames and the lexicon)."""
+
+    fields = (form_fields(tables[FORM_NAMES_TABLE])
+              if FORM_NAMES_TABLE in tables else {})
+
+    # Syntactic category -> [(FormName, FieldName), ...]
+    names_by_syncat = {}
+    for (syncat, form_name), fieldname in fields.items():
+        names_by_syncat.setdefault(syncat, []).append((form_name, fieldname))
+
+    forms = {}
+
+    for table_name, syncat in LEXICON_TABLES.items():
+        if table_name not in tables or syncat not in names_by_syncat:
+            continue
+
+        lexicon_object = tables[table_name]
+        fieldnames = lexicon_object._fieldnames
+        # (FormName, lexicon field) of the forms present in this table.
+        names = [(form_name, _lexicon_fieldname(fieldname, fieldnames))
+                 for form_name, fieldname in names_by_syncat[syncat]]
+        names = [(form_name, fieldname) for form_name, fieldname in names
+                 if fieldname is not None]
+        if not names:
+            continue
+
+        for rule in lexicon_object._rules:
+            entry_id = rule['EntryID']
+            for form_name, fieldname in names:
+                form = rule[fieldname]
+                if form != '':
+                    key = (table_name, entry_id, form_name)
+                    # (Keys of different tables never collide.)
+                    if key in forms:
+                        raise ValueError(
+                            f'Error: duplicate EntryID {entry_id} in '
+                            f'{table_name} (form {form_name}: '
+                            f'{forms[key]!r} and {form!r}).')
+                    forms[key] = form
+
+    return FormIndex(forms, fields)
+
+#==============================================================================
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Incremental re-import of a table: only rows that changed since the last
+import are parsed again.
+
+Each raw row is hashed.  On reload, a row whose hash equals that of the
+previous row at the same position, or of an unused previous row elsewhere
+(e.g., after rows were inserted or deleted), keeps its previous parse.
+The remaining rows are parsed together by a fresh object of the same
+class, and all parsed rules are spliced back in record order.
+
+This works for any of the table classes, since import_table of each
+class parses the records independently of each other.
+
+============================================================================"""
+
+import hashlib
+import weakref
+import itertools
+
+#------------------------------------------------------------------------------
+
+def hash_row(row: list) -> bytes:
+    """Digest of a raw row (list of field strings)."""
+
+    h = hashlib.blake2b(digest_size=16)
+    for field in row:
+        h.update(field.encode('utf-8', 'surrogatepass'))
+        h.update(b'\x1f') # field delimiter
+    return h.digest()
+
+#------------------------------------------------------------------------------
+
+# Table object -> generation (see touch).
+_generations = weakref.WeakKeyDictionary()
+_next_generation = itertools.count(1)
+
+def touch(table_object):
+    """Record that the rules of a table object changed: it gets a new
+    generation.  The import_table of the table classes,
+    set_rules_in_record_order and _delta.DirtyTracker do this; code that
+    edits rules in place otherwise should call it."""
+
+    _generations[table_object] = next(_next_generation)
+
+def generation(table_object) -> int:
+    """The generation of a table object: a number that changes whenever
+    its rules change (see touch), and that no other object ever has, so
+    that cached results derived from the object can be validated cheaply.
+    """
+
+    g = _generations.get(table_object)
+    if g is None:
+        touch(table_object)
+        g = _generations[table_object]
+
+    return g
+
+#------------------------------------------------------------------------------
+
+def rules_in_record_order(table_object) -> list:
+    """The parsed rules of a table object in the order of the records.
+
+    (Some classes, e.g. those for Ontology concepts, keep their rules
+    sorted by ID, with the inverse permutation in _iperm.)
+    """
+
+    iperm = getattr(table_object, '_iperm', None)
+    if iperm is None:
+        return list(table_object._rules)
+
+    return [table_object._rules[k] for k in iperm]
+
+#------------------------------------------------------------------------------
+
+def set_rules_in_record_order(table_object, rules: list):
+    """Inverse of rules_in_record_order: store rules into a table object."""
+
+    if getattr(table_object, '_iperm', None) is None:
+        table_object._rules = rules
+
+    else:
+        # Sort to be in proper order (ascending order in key "ID"), as in
+        # the import_table of these classes.
+        perm = sorted(range(len(rules)), key=lambda k: rules[k]['ID'])
+        iperm = [0] * len(rules)
+        for i, p in enumerate(perm):
+            iperm[p] = i
+        table_object._perm = perm
+        table_object._iperm = iperm
+        table_object._rules = [rules[k] for k in perm]
+
+    table_object._num_rules = len(rules)
+
+    touch(table_object)
+
+#==============================================================================
+
+class IncrementalImporter:
+    """
+    Import a table into a table object, reparsing only changed rows on
+    subsequent imports.
+    """
+
+    def __init__(self, table_object):
+        """Constructor for class."""
+
+        self.table_object = table_object
+
+        self._header = None
+        self._hashes = []
+
+        # Number of rows parsed by the last import.
+        self.num_parsed = 0
+
+#------------------------------------------------------------------------------
+
+    def import_table(self, table: list):
+        """Import the table (list of rows, the first is the header)."""
+
+        assert len(table) >= 1, 'Error: malformed input table.'
+
+        hashes = [hash_row(row) for row in table[1:]]
+
+        # First import, or change of fields: parse everything.
+
+        if self._header is None or table[0] != self._header:
+            self.table_object.import_table(table)
+            self._header = list(table[0])
+            self._hashes = hashes
+            self.num_parsed = len(hashes)
+            return
+
+        old_rules = rules_in_record_order(self.table_object)
+        old_hashes = self._hashes
+
+        rules = [None] * len(hashes)
+        used = [False] * len(old_hashes)
+
+        # Unchanged rows at the same position.
+        for i, h in enumerate(hashes):
+            if i < len(old_hashes) and old_hashes[i] == h:
+                rules[i] = old_rules[i]
+                used[i] = True
+
+        # Unchanged rows that moved.
+        unused = {}
+        for k, h in enumerate(old_hashes):
+            if not used[k]:
+                unused.setdefault(h, []).append(k)
+
+        changed = []
+        for i, h in enumerate(hashes):
+            if rules[i] is None:
+                if unused.get(h):
+                    rules[i] = old_rules[unused[h].pop(0)]
+                else:
+                    changed.append(i)
+
+        # Parse the changed rows.
+
+        if changed:
+            parser = type(self.table_object)()
+            parser.import_table([table[0]] + [table[i+1] for i in changed])
+            for i, rule in zip(changed, rules_in_record_order(parser)):
+                rules[i] = rule
+
+        set_rules_in_record_order(self.table_object, rules)
+        self.table_object._fieldnames_order_orig = list(table[0])
+        self.table_object._is_set = True
+
+        self._hashes = hashes
+        self.num_parsed = len(changed)
+
+#==============================================================================
@@ -21,6 +21,9 @@ import sys
 import re
 
 import _utils
+import _intern
+import _profiling
+import _structure_memo
 
 #------------------------------------------------------------------------------
 
@@ -123,7 +126,7 @@ def import_input_structure(in_: str, rule_type: int) -> list:
 
         # Check does the second field denote a special situation.
         # Orig code: split on ~!~
-        is_user_defined_syncat = re.search('~!~', f)
+        is_user_defined_syncat = bool(re.search('~!~', f))
 
         # If it is this special situation, then split second token
         # into two subtokens, delimiter "~!~".
@@ -178,11 +181,17 @@ def import_input_structure(in_: str, rule_type: int) -> list:
             'r': r,
         })
 
+    # Share equal strings between constituents (and rules).
+    if _intern._enabled:
+        _intern.intern_rule(out)
+
     return [source_loc, dest_loc, out] if dest_loc != None else (
            [comment, out] if comment != '' else out)
 
 #------------------------------------------------------------------------------
 
+@_profiling.profiled_rule_type
+@_structure_memo.memoized
 def import_input_structures(in_: str, rule_type: int) -> list:
     """Do import_input_structure for a string with muliple structures."""
 
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+String interning pool for parsed tables.
+
+Parsed tables repeat the same small strings a great many times: Status
+"0"/"1", syncat codes, rule types, feature value strings, modifier
+characters, the tokens of every constituent of an InputStructure, etc.
+When enabled, the structure parsers (_input_structures, _output_structures,
+_spellout_tables) pass their results through this pool, and the importers
+generated by _schema the other fields, so that equal strings share one
+object.  Each string is interned once, where it is parsed: the rules as a
+whole are not walked again.
+
+Only strings up to MAX_INTERN_LENGTH characters are pooled; longer ones
+(comments, whole structures) are rarely equal and would only keep memory
+alive.  Note the pool is process-wide and is never emptied except by
+clear_pool.
+
+Interning is off by default: it saves memory at a cost in import time.
+It is enabled by configure(), or for the whole run by the environment
+variable PARSING_INTERN=1.
+
+============================================================================"""
+
+import os
+import sys
+
+MAX_INTERN_LENGTH = 64
+
+_enabled = os.environ.get('PARSING_INTERN', '') not in ('', '0')
+
+_pool = {}
+
+#------------------------------------------------------------------------------
+
+def is_enabled() -> bool:
+    """Whether the parsers intern their results."""
+
+    return _enabled
+
+#------------------------------------------------------------------------------
+
+def configure(enabled: bool = True):
+    """Enable (or disable) interning by the parsers."""
+
+    global _enabled
+    _enabled = enabled
+
+#------------------------------------------------------------------------------
+
+def intern_str(s: str) -> str:
+    """Return the pooled string equal to s."""
+
+    if len(s) > MAX_INTERN_LENGTH:
+        return s
+
+    return _pool.setdefault(s, s)
+
+#------------------------------------------------------------------------------
+
+def intern_rule(obj):
+    """Intern, in place, all strings in a parsed rule or structure
+    (nested dicts and lists); returns obj.
+
+    Subclasses of dict and list (the read-only shared results of
+    _structure_memo, already interned) are left as they are.
+    """
+
+    if type(obj) is dict:
+        for key, value in obj.items():
+            if type(value) is str:
+                obj[key] = intern_str(value)
+            elif type(value) in (dict, list):
+                intern_rule(value)
+
+    elif type(obj) is list:
+        for i, value in enumerate(obj):
+            if type(value) is str:
+                obj[i] = intern_str(value)
+            elif type(value) in (dict, list):
+                intern_rule(value)
+
+    return obj
+
+#------------------------------------------------------------------------------
+
+def intern_value(obj):
+    """intern_str for a string, intern_rule for a parsed structure."""
+
+    if type(obj) is str:
+        return intern_str(obj)
+
+    return intern_rule(obj)
+
+#------------------------------------------------------------------------------
+
+def memory_stats() -> dict:
+    """Statistics of the pool (computed on demand)."""
+
+    return {
+        'enabled': _enabled,
+        'distinct': len(_pool),
+        'pool_bytes': sum(sys.getsizeof(s) for s in _pool),
+    }
+
+#------------------------------------------------------------------------------
+
+def clear_pool():
+    """Empty the pool."""
+
+    _pool.clear()
+
+#==============================================================================
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Streaming export of parsed tables to JSON Lines files, and import back.
+
+One file per table (<dir>/<db_name>/<table_name>.jsonl, as for the CSV
+files).  The first line is a header:
+    {"format": "parsed-table", "version": 1, "db_name": ...,
+     "table_name": ..., "num_rules": ..., "state": {...},
+     "layouts": [[fieldname, ...], ...]}
+where state is that of the table object (header order, field names,
+permutation, ...) and layouts are the lists of the keys of the rules.
+Each following line is one parsed rule, in record order, as an array:
+the index of its layout, then the values of its fields in that order
+(nested structures, spellout layers etc. as they are parsed).  E.g.:
+    [0,"1","N",[[{"InputPresent":2,...}],true],...]
+
+Rules are written and read one at a time, so memory is constant beyond
+the table object itself.  Since every line is one rule, a file can be
+split into byte ranges (chunk_ranges) that are read independently, e.g.
+by several processes (read_table with max_workers).
+
+Usage:
+    _jsonl_store.write_tables('parsed', tables)
+    ...
+    tables = _jsonl_store.read_tables('parsed')
+    path = 'parsed/English/Rules_Transfer.jsonl'
+    for rule in _jsonl_store.iter_rules(path):
+        ...
+
+============================================================================"""
+
+import os
+import json
+import concurrent.futures
+
+import _intern
+import _registry
+
+FORMAT = 'parsed-table'
+VERSION = 1
+
+EXTENSION = '.jsonl'
+
+_encode = json.JSONEncoder(ensure_ascii=False, check_circular=False,
+                           separators=(',', ':')).encode
+
+#==============================================================================
+# Writing.
+
+def write_table(path: str, table_object, table_name: str,
+                db_name: str = ''):
+    """Write a parsed table to a JSON Lines file."""
+
+    assert table_object._is_set, (
+        'Error: cannot export because table has not been set.')
+
+    rules = table_object._rules
+    iperm = getattr(table_object, '_iperm', None)
+    record_order = range(len(rules)) if iperm is None else iperm
+
+    # Layouts of the rules (usually one per table).
+    layouts = {}
+    for rule in rules:
+        layouts.setdefault(tuple(rule), len(layouts))
+
+    header = {
+        'format': FORMAT,
+        'version': VERSION,
+        'db_name': db_name,
+        'table_name': table_name,
+        'num_rules': len(rules),
+        'state': {k: v for k, v in vars(table_object).items()
+                  if k != '_rules'},
+        'layouts': [list(layout) for layout in layouts],
+    }
+
+    with open(path, 'w', encoding='utf-8', newline='\n') as fp:
+        fp.write(_encode(header) + '\n')
+        for k in record_order:
+            rule = rules[k]
+            fp.write(_encode([layouts[tuple(rule)], *rule.values()]) + '\n')
+
+#------------------------------------------------------------------------------
+
+def write_tables(out_dir: str, tables: dict):
+    """Write parsed tables, given as {db_name: {table_name: table object}}
+    (as returned by _mdb_pipeline.load_databases)."""
+
+    for db_name, table_objects in tables.items():
+        os.makedirs(os.path.join(out_dir, db_name), exist_ok=True)
+        for table_name, table_object in table_objects.items():
+            write_table(os.path.join(out_dir, db_name,
+                                     table_name + EXTENSION),
+                        table_object, table_name, db_name)
+
+#==============================================================================
+# Reading.
+
+def _read_header(fp) -> dict:
+    """Read and check the header line of an open (binary) file."""
+
+    header = json.loads(fp.readline())
+
+    if header.get('format') != FORMAT or header.get('version') != VERSION:
+        raise ValueError(f'Error: {fp.name} is not a {FORMAT} file '
+                         f'of version {VERSION}.')
+
+    return header
+
+#------------------------------------------------------------------------------
+
+def read_header(path: str) -> dict:
+    """The header of a file (see module docstring)."""
+
+    with open(path, 'rb') as fp:
+        return _read_header(fp)
+
+#------------------------------------------------------------------------------
+
+def iter_rules(path: str, start: int = 0, end: int = None,
+               intern_strings: bool = None):
+    """Yield the rules of a file, in record order.
+
+    With start/end (byte offsets, e.g. from chunk_ranges), only the rules
+    whose line starts in [start, end) are read.  intern_strings defaults
+    to whether interning is enabled (see _intern).
+    """
+
+    if intern_strings is None:
+        intern_strings = _intern.is_enabled()
+
+    with open(path, 'rb') as fp:
+
+        layouts = [tuple(layout) for layout in _read_header(fp)['layouts']]
+
+        # Go to the first line starting at or after start.
+        if start > fp.tell():
+            fp.seek(start - 1)
+            fp.readline()
+
+        while end is None or fp.tell() < end:
+            line = fp.readline()
+            if not line:
+                break
+            values = json.loads(line)
+            rule = dict(zip(layouts[values[0]], values[1:]))
+            yield _intern.intern_rule(rule) if intern_strings else rule
+
+#------------------------------------------------------------------------------
+
+def chunk_ranges(path: str, num_chunks: int) -> list:
+    """Split a file into at most num_chunks byte ranges of about equal
+    size, for iter_rules."""
+
+    size = os.path.getsize(path)
+    step = max(-(-size // max(num_chunks, 1)), 1)
+
+    return [(start, min(start + step, size))
+            for start in range(0, size, step)]
+
+#------------------------------------------------------------------------------
+
+def _read_chunk(path: str, start: int, end: int,
+                intern_strings: bool) -> list:
+    """Rules of a byte range of a file (for worker processes)."""
+
+    return list(iter_rules(path, start, end, intern_strings))
+
+#------------------------------------------------------------------------------
+
+def read_table(path: str, max_workers: int = None,
+               intern_strings: bool = None):
+    """Rebuild a table object from a file (without parsing).
+
+    With max_workers > 1, the file is read in chunks by as many worker
+    processes.  intern_strings defaults to whether interning is enabled
+    (see _intern).
+    """
+
+    if intern_strings is None:
+        intern_strings = _intern.is_enabled()
+
+    header = read_header(path)
+
+    if max_workers is None or max_workers <= 1:
+        rules = list(iter_rules(path, intern_strings=intern_strings))
+
+    else:
+        rules = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers) as pool:
+            futures = [
+                pool.submit(_read_chunk, path, start, end, intern_strings)
+                for start, end in chunk_ranges(path, max_workers)]
+            for future in futures:
+                rules += future.result()
+
+    assert len(rules) == header['num_rules'], (
+        f'Error: {path} has {len(rules)} rules, '
+        f'expected {header["num_rules"]}.')
+
+    table_object = _registry.create_table_object(header['table_name'])
+    vars(table_object).update(header['state'])
+
+    # Sorted by ID for the classes that have a permutation.
+    perm = getattr(table_object, '_perm', None)
+    table_object._rules = rules if perm is None else [rules[k] for k in perm]
+
+    return table_object
+
+#------------------------------------------------------------------------------
+
+def read_tables(in_dir: str, db_names: list = None,
+                table_names: list = None, max_workers: int = None) -> dict:
+    """Rebuild table objects from a directory written by write_tables;
+    returns {db_name: {table_name: table object}}.
+
+    db_names and table_names restrict the tables (default: all).
+    """
+
+    out = {}
+
+    for db_name in sorted(os.listdir(in_dir)):
+        if db_names is not None and db_name not in db_names:
+            continue
+        for file_name in sorted(os.listdir(os.path.join(in_dir, db_name))):
+            table_name, extension = os.path.splitext(file_name)
+            if extension != EXTENSION or (
+                table_names is not None and table_name not in table_names):
+                continue
+            out.setdefault(db_name, {})[table_name] = read_table(
+                os.path.join(in_dir, db_name, file_name), max_workers)
+
+    return out
+
+#==============================================================================
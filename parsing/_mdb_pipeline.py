@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Concurrent extraction and parsing of the tables of .mdb files.
+
+Instead of running mdb-export serially into CSV files (mdb2csv.bash) and
+parsing the files afterwards, this launches mdb-export subprocesses with
+asyncio, at most max_concurrency at a time, reads their output as it is
+produced, and imports each table into its table class (see _registry) as
+soon as its export is complete, while other exports are still running.
+The imports run in a worker thread (one at a time, as the parsing code
+is not meant to run concurrently), so that the event loop keeps draining
+the pipes of the running exports meanwhile; otherwise an export would
+block on its full pipe during a long parse.
+
+Usage:
+    tables = _mdb_pipeline.load_databases(mdb_dir, ['English', 'Ontology'])
+    tables['English']['Rules_Transfer'].export_table()
+
+The mdb_export argument gives the command to run (e.g. a stub that emits
+canned CSV, for testing); it is called as: mdb_export <mdb file> <table>.
+Its output is decoded as it arrives by _csv_stream; read_mdb_table does
+the same synchronously for a single table.
+
+============================================================================"""
+
+import os
+import asyncio
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import _registry
+import _csv_stream
+import _table_stats
+
+#==============================================================================
+
+async def export_table(mdb_path: str, table_name: str,
+                       mdb_export: str = 'mdb-export',
+                       encoding: str = 'utf-8') -> list:
+    """Run mdb-export on one table; returns its rows (header first)."""
+
+    process = await asyncio.create_subprocess_exec(
+        mdb_export, mdb_path, _registry.mdb_file_table_name(table_name),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+
+    async def read_rows():
+        decoder = _csv_stream.CsvStreamDecoder(encoding)
+        rows = []
+        while True:
+            chunk = await process.stdout.read(_csv_stream.CHUNK_SIZE)
+            if not chunk:
+                break
+            rows += decoder.feed(chunk)
+        return rows + decoder.close()
+
+    try:
+        rows, stderr = await asyncio.gather(read_rows(),
+                                            process.stderr.read())
+        returncode = await process.wait()
+    except BaseException:
+        # Cancelled (e.g. another export failed): end the process.
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+        raise
+
+    if returncode != 0:
+        raise RuntimeError(
+            f'Error: {mdb_export} failed on {mdb_path} {table_name} '
+            f'(exit code {returncode}): {stderr.decode(errors="replace")}')
+
+    return rows
+
+#------------------------------------------------------------------------------
+
+def read_mdb_table(mdb_path: str, table_name: str,
+                   mdb_export: str = 'mdb-export',
+                   encoding: str = 'utf-8') -> list:
+    """Synchronous version of export_table: the rows are decoded straight
+    from the pipe of mdb-export, with no intermediate CSV file.
+
+    Usage:
+        table_object.import_table(read_mdb_table(mdb_path, table_name))
+    """
+
+    # (stderr goes to a file so that it can't fill up and block.)
+    with tempfile.TemporaryFile() as stderr, subprocess.Popen(
+        [mdb_export, mdb_path, _registry.mdb_file_table_name(table_name)],
+        stdout=subprocess.PIPE, stderr=stderr) as process:
+
+        rows = list(_csv_stream.iter_rows(process.stdout, encoding))
+        returncode = process.wait()
+
+        if returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(
+                f'Error: {mdb_export} failed on {mdb_path} {table_name} '
+                f'(exit code {returncode}): '
+                f'{stderr.read().decode(errors="replace")}')
+
+    return rows
+
+#------------------------------------------------------------------------------
+
+async def load_databases_async(mdb_dir: str, db_names: list,
+                               table_names: list = None,
+                               max_concurrency: int = 4,
+                               mdb_export: str = 'mdb-export') -> dict:
+    """Export and import the tables of the given databases (<db_name>.mdb
+    in mdb_dir); returns {db_name: {table_name: table object}}.
+
+    table_names restricts the tables (default: all those in _registry
+    for the database).
+    """
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    loop = asyncio.get_running_loop()
+    # Single thread for the imports (see above).
+    parser = ThreadPoolExecutor(max_workers=1)
+
+    def parse(db_name, table_name, rows):
+        table_object = _registry.create_table_object(table_name)
+        with _table_stats.database(db_name):
+            table_object.import_table(rows)
+        return table_object
+
+    async def load(db_name, table_name):
+        async with semaphore:
+            rows = await export_table(
+                os.path.join(mdb_dir, db_name + '.mdb'), table_name,
+                mdb_export=mdb_export)
+        # Parse while the next exports run (and are read).
+        table_object = await loop.run_in_executor(
+            parser, parse, db_name, table_name, rows)
+        return db_name, table_name, table_object
+
+    jobs = []
+    for db_name in db_names:
+        names = _registry.table_names(is_ontology=(db_name == 'Ontology'))
+        for table_name in names:
+            if table_names is None or table_name in table_names:
+                jobs.append(load(db_name, table_name))
+
+    tasks = [asyncio.ensure_future(job) for job in jobs]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        # Stop the other exports before reporting the error.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        parser.shutdown(wait=True)
+
+    out = {db_name: {} for db_name in db_names}
+    for db_name, table_name, table_object in results:
+        out[db_name][table_name] = table_object
+
+    return out
+
+#------------------------------------------------------------------------------
+
+def load_databases(*args, **kwargs) -> dict:
+    """Synchronous wrapper of load_databases_async."""
+
+    return asyncio.run(load_databases_async(*args, **kwargs))
+
+#==============================================================================
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Shared, read-only Ontology for the processing of several languages.
+
+Every language needs the parsed Ontology tables (concepts, hierarchies,
+Ontology_Features_Source, ...).  An OntologyContext holds them; it is
+loaded once per process (get_context caches it by source), either by
+parsing (CSV files or .mdb file) or from the parsed-table caches
+(_jsonl_store, _sqlite_store), and handed to each language's processing.
+
+The context must be treated as read-only: it is shared by all languages,
+and with map_languages by all worker processes.  Where the fork start
+method is available, the workers inherit the parent's context (copy-on-
+write; the garbage collector is frozen first so that it does not touch,
+and thus copy, the pages of the Ontology objects).  Elsewhere, each worker
+loads the context once from its source, which should then be a parsed-
+table cache; a context with no source (built from tables in memory) is
+published in shared memory for the workers (see _shared_tables).
+
+Usage:
+    context = _ontology_context.get_context(jsonl_dir='parsed')
+    results = _ontology_context.map_languages(
+        process_language, ['English', 'Tagalog'], context, processes=4)
+where process_language(db_name, context) is a module-level function.
+
+============================================================================"""
+
+import os
+import gc
+import sys
+import csv
+import multiprocessing
+
+import _registry
+
+# (The loaders and _shared_tables are imported where they are used, so
+# that a context costs only the imports of its source.)
+
+# Avoid csv size failure (as in tester).
+csv.field_size_limit(sys.maxsize)
+
+ONTOLOGY_DB_NAME = 'Ontology'
+
+# Contexts loaded in this process, by source.
+_contexts = {}
+
+# Context of the worker processes of map_languages.
+_worker_context = None
+
+#==============================================================================
+
+class OntologyContext:
+    """
+    The parsed Ontology tables, by table name (e.g. "Ontology_Nouns").
+    """
+
+    def __init__(self, tables: dict, source: dict = None):
+        """Constructor for class."""
+
+        self._tables = dict(tables)
+        # Keyword arguments of get_context to load the context again.
+        self.source = dict(source or {})
+
+    def __getitem__(self, table_name: str):
+        return self._tables[table_name]
+
+    def __contains__(self, table_name: str) -> bool:
+        return table_name in self._tables
+
+    def table_names(self) -> list:
+        """Names of the tables in the context."""
+
+        return list(self._tables)
+
+#------------------------------------------------------------------------------
+
+def load_context(csv_dir: str = None, jsonl_dir: str = None,
+                 sqlite_path: str = None, mdb_dir: str = None,
+                 table_names: list = None) -> OntologyContext:
+    """Load the Ontology tables from exactly one source: a directory of CSV
+    files (as for tester), a directory written by _jsonl_store, a database
+    written by _sqlite_store, or a directory with Ontology.mdb.
+
+    table_names restricts the tables (default: all Ontology tables).
+    """
+
+    source = {k: v for k, v in [('csv_dir', csv_dir),
+        ('jsonl_dir', jsonl_dir), ('sqlite_path', sqlite_path),
+        ('mdb_dir', mdb_dir)] if v is not None}
+    assert len(source) == 1, 'Error: give exactly one source.'
+
+    names = _registry.table_names(is_ontology=True) if (
+        table_names is None) else list(table_names)
+
+    if csv_dir is not None:
+        tables = {}
+        for table_name in names:
+            file_path = os.path.join(csv_dir, ONTOLOGY_DB_NAME,
+                _registry.mdb_file_table_name(table_name) + '.csv')
+            with open(file_path, newline='') as csvfile:
+                table = [row for row in csv.reader(csvfile)]
+            tables[table_name] = _registry.create_table_object(table_name)
+            tables[table_name].import_table(table)
+
+    elif jsonl_dir is not None:
+        import _jsonl_store
+        tables = _jsonl_store.read_tables(jsonl_dir, [ONTOLOGY_DB_NAME],
+            names).get(ONTOLOGY_DB_NAME, {})
+
+    elif sqlite_path is not None:
+        import _sqlite_store
+        tables = _sqlite_store.import_tables(sqlite_path, [ONTOLOGY_DB_NAME],
+            names).get(ONTOLOGY_DB_NAME, {})
+
+    else:
+        import _mdb_pipeline
+        tables = _mdb_pipeline.load_databases(mdb_dir, [ONTOLOGY_DB_NAME],
+            names)[ONTOLOGY_DB_NAME]
+
+    missing = [name for name in names if name not in tables]
+    assert not missing, f'Error: missing Ontology tables {missing}.'
+
+    if table_names is not None:
+        source['table_names'] = list(table_names)
+
+    return OntologyContext({name: tables[name] for name in names}, source)
+
+#------------------------------------------------------------------------------
+
+def get_context(**source) -> OntologyContext:
+    """The context of a source (see load_context), loaded on first use and
+    then shared by all callers in this process."""
+
+    key = tuple(sorted((k, tuple(v) if isinstance(v, list) else v)
+                       for k, v in source.items()))
+
+    context = _contexts.get(key)
+    if context is None:
+        context = _contexts[key] = load_context(**source)
+
+    return context
+
+#==============================================================================
+# Multiprocess.
+
+def _init_worker(source: dict):
+    """Initializer of the workers when not forked: load the context."""
+
+    global _worker_context
+    _worker_context = get_context(**source)
+
+def _init_worker_shared(name: str):
+    """Initializer of the workers when not forked, for a context with no
+    source: copy the tables published in shared memory."""
+
+    global _worker_context
+    import _shared_tables
+    with _shared_tables.attach(name) as shared:
+        _worker_context = OntologyContext({
+            table_name: shared[db_name, table_name].table_object()
+            for db_name, table_name in shared.keys()})
+
+def _call(func, db_name: str):
+    """Run func for one language in a worker."""
+
+    return func(db_name, _worker_context)
+
+#------------------------------------------------------------------------------
+
+def map_languages(func, db_names: list, context: OntologyContext,
+                  processes: int = None) -> list:
+    """Run func(db_name, context) for each language, in worker processes
+    sharing context; returns the results in the order of db_names.
+
+    func must be a module-level function (it is pickled by reference).
+    """
+
+    global _worker_context
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        mp = multiprocessing.get_context('fork')
+        _worker_context = context
+        # Keep the collector from writing to (thus copying) shared pages.
+        gc.collect()
+        gc.freeze()
+        try:
+            with mp.Pool(processes) as pool:
+                return pool.starmap(_call,
+                                    [(func, db_name) for db_name in db_names])
+        finally:
+            gc.unfreeze()
+            _worker_context = None
+
+    mp = multiprocessing.get_context('spawn')
+
+    if context.source:
+        with mp.Pool(processes, initializer=_init_worker,
+                     initargs=(context.source,)) as pool:
+            return pool.starmap(_call,
+                                [(func, db_name) for db_name in db_names])
+
+    # No source to load the context from: hand the tables over.
+    import _shared_tables
+    published = _shared_tables.publish({ONTOLOGY_DB_NAME: {
+        table_name: context[table_name]
+        for table_name in context.table_names()}})
+    try:
+        with mp.Pool(processes, initializer=_init_worker_shared,
+                     initargs=(published.name,)) as pool:
+            return pool.starmap(_call,
+                                [(func, db_name) for db_name in db_names])
+    finally:
+        published.close()
+        published.unlink()
+
+#==============================================================================
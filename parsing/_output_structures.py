@@ -15,6 +15,9 @@ import sys
 import re
 
 import _utils
+import _intern
+import _profiling
+import _structure_memo
 
 #------------------------------------------------------------------------------
 
@@ -219,10 +222,16 @@ CopyPhrase: //the beginning of the copy sequence is a phrase or clause, so don't
             'is_user_defined_syncat': is_user_defined_syncat,
         })
 
+    # Share equal strings between constituents (and rules).
+    if _intern._enabled:
+        _intern.intern_rule(out)
+
     return out
 
 #------------------------------------------------------------------------------
 
+@_profiling.profiled_rule_type
+@_structure_memo.memoized
 def import_output_structures(in_: str, rule_type: int) -> list:
     """Do import_output_structure for a string with muliple structures."""
 
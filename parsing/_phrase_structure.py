@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Trees and grammar index for the rules of a Rules_PhraseStructure table.
+
+The Rule field of a phrase structure rule is parsed (by
+RulesPhraseStructure) into a flat list of subfields, one per tree node in
+preorder:
+- ['*', level, group name] is a non-leaf node; level 0 is a top branch,
+  and the node belongs to the closest preceding non-leaf node of lower
+  level (or to the root, i.e., the rule's syntactic category).
+- ['&', syncat name, features, example, (name)] is a leaf for a
+  user-defined syntactic category.
+- [syncat, features, example, (name)] is any other leaf.
+A leaf belongs to the closest preceding non-leaf node.
+
+Each node is a dict; its "tag" is the syncat id for a leaf, "&" plus the
+syncat name for a user-defined leaf, or the group name for a non-leaf
+node.
+
+============================================================================"""
+
+#------------------------------------------------------------------------------
+
+def build_phrase_structure_tree(rule: dict) -> dict:
+    """Build the tree of a parsed phrase structure rule."""
+
+    root = {
+        'kind': 'root',
+        'level': -1,
+        'tag': rule['SyntacticCategory'],
+        'children': [],
+    }
+
+    # Chain of open non-leaf nodes, root first.
+    stack = [root]
+
+    for subfield in rule['Rule']:
+
+        # Empty line.
+        if subfield == []:
+            continue
+
+        # Non leaf node.
+        if subfield[0] == '*':
+            level = int(subfield[1])
+            while stack[-1]['level'] >= level:
+                stack.pop()
+            node = {
+                'kind': '*',
+                'level': level,
+                'tag': subfield[2],
+                'children': [],
+            }
+            stack[-1]['children'].append(node)
+            stack.append(node)
+            continue
+
+        # User defined syncat leaf node.
+        if subfield[0] == '&':
+            kind, fields = '&', subfield[1:]
+            tag = '&' + fields[0]
+        # Non user defined leaf node.
+        else:
+            kind, fields = '', subfield
+            tag = fields[0]
+
+        fields = fields + [''] * (4 - len(fields))
+
+        stack[-1]['children'].append({
+            'kind': kind,
+            'tag': tag,
+            'features': fields[1],
+            'example': fields[2],
+            'name': fields[3],
+        })
+
+    return root
+
+#------------------------------------------------------------------------------
+
+def iter_phrase_structure_nodes(node: dict):
+    """Yield the non-leaf nodes (including the root) of a tree, preorder."""
+
+    if 'children' in node:
+        yield node
+        for child in node['children']:
+            yield from iter_phrase_structure_nodes(child)
+
+#==============================================================================
+
+class PhraseStructureIndex:
+    """
+    Grammar view of the rules of an imported RulesPhraseStructure object.
+
+    -----------------------------------------------------------------------
+    Notes
+
+    Rules are referred to by their (0-based) position in the table.
+
+    productions: parent tag -> list of (child tags, rule position), in
+    rule order; the parent of a rule's top branches is its syntactic
+    category.
+
+    candidates: child tags -> list of (rule position, node) for each
+    non-leaf node with exactly those children.
+
+    -----------------------------------------------------------------------
+    """
+
+    def __init__(self, table_object, include_inactive: bool = False):
+        """Build the trees and the index of a table."""
+
+        assert table_object._is_set, (
+            'Error: cannot index because table has not been set.')
+
+        self.trees = []
+        self.productions = {}
+        self.candidates = {}
+
+        for i, rule in enumerate(table_object._rules):
+
+            tree = build_phrase_structure_tree(rule)
+            self.trees.append(tree)
+
+            if rule['Status'] != '1' and not include_inactive:
+                continue
+
+            for node in iter_phrase_structure_nodes(tree):
+                child_tags = tuple(child['tag'] for child in node['children'])
+                if child_tags == ():
+                    continue
+                self.productions.setdefault(node['tag'], []).append(
+                    (child_tags, i))
+                self.candidates.setdefault(child_tags, []).append((i, node))
+
+#------------------------------------------------------------------------------
+
+    def rules_for_children(self, child_tags) -> list:
+        """Positions of the rules having a node with these child tags."""
+
+        out = []
+        for i, _ in self.candidates.get(tuple(child_tags), []):
+            if out == [] or out[-1] != i:
+                out.append(i)
+
+        return out
+
+#------------------------------------------------------------------------------
+
+    def children_of(self, parent_tag: str) -> list:
+        """The child tag sequences allowed under a parent tag."""
+
+        return [child_tags for child_tags, _ in
+                self.productions.get(parent_tag, [])]
+
+#==============================================================================
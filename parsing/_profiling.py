@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Opt-in profiling of table parsing: wall time and call counts.
+
+Recorded are:
+- each import_table / export_table call, per class
+  (e.g. "RulesTransfer.import_table");
+- each import_input_structures / import_output_structures /
+  import_spellout_tables call, per rule type
+  (e.g. "import_input_structures[Rules_Transfer]");
+- the parse time of each field with a codec in the tables using _schema,
+  summed over the rows (e.g. "RulesClitic.import_table:InputStructure");
+  the importer generated when profiling is on times its codecs, the one
+  used otherwise has no timing code.  (The structure fields of the
+  hand-written rule classes are covered by the structure importers.)
+Timings are inclusive: the time of a field includes that of the structure
+importers it calls.
+
+Profiling is enabled either for the whole run by the environment variable
+PARSING_PROFILE (a text report is then printed to stderr at exit; if the
+value is not "1", it is taken as the path of a JSON file to write the
+results to), or for a block of code by the context manager profiling():
+
+    with _profiling.profiling():
+        table_object.import_table(table)
+    print(_profiling.report())
+
+When disabled, an instrumented call costs one flag test; import_table
+tests a second flag, that of table statistics (see table_stats).
+
+============================================================================"""
+
+import os
+import sys
+import json
+import atexit
+import functools
+import contextlib
+import contextvars
+from time import perf_counter
+
+import _utils
+
+_enabled = False
+
+# name -> [calls, total seconds, max seconds]
+_records = {}
+
+# Name of the import_table/export_table being profiled (see record_fields).
+_method = contextvars.ContextVar('method', default='')
+
+# Whether table statistics are enabled: set from PARSING_STATS, then by
+# _table_stats (see table_stats).
+_stats_enabled = os.environ.get('PARSING_STATS', '') not in ('', '0')
+
+#------------------------------------------------------------------------------
+
+def is_enabled() -> bool:
+    """Whether profiling is currently on."""
+
+    return _enabled
+
+#------------------------------------------------------------------------------
+
+def record(name: str, seconds: float):
+    """Add one call of the given duration to the entry name."""
+
+    entry = _records.get(name)
+    if entry is None:
+        _records[name] = [1, seconds, seconds]
+    else:
+        entry[0] += 1
+        entry[1] += seconds
+        if seconds > entry[2]:
+            entry[2] = seconds
+
+#------------------------------------------------------------------------------
+
+def reset():
+    """Discard all recorded results."""
+
+    _records.clear()
+
+#------------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def profiling(reset_results: bool = True):
+    """Enable profiling within a with block."""
+
+    global _enabled
+
+    if reset_results:
+        reset()
+
+    previous = _enabled
+    _enabled = True
+    try:
+        yield
+    finally:
+        _enabled = previous
+
+#==============================================================================
+# Instrumentation.
+
+def profiled_method(func):
+    """Decorator for import_table/export_table: record per class (of the
+    object, so that subclasses are reported under their own name).  An
+    import is also passed to _table_stats when it is enabled."""
+
+    is_import = func.__name__ == 'import_table'
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not _enabled:
+            out = func(self, *args, **kwargs)
+        else:
+            name = f'{type(self).__name__}.{func.__name__}'
+            token = _method.set(name)
+            t = perf_counter()
+            try:
+                out = func(self, *args, **kwargs)
+            finally:
+                record(name, perf_counter() - t)
+                _method.reset(token)
+        if is_import and _stats_enabled:
+            # Table statistics are collected here too (see _table_stats).
+            table_stats().record(self, args[0] if args else kwargs['table'])
+        return out
+
+    return wrapper
+
+#------------------------------------------------------------------------------
+
+def table_stats():
+    """The _table_stats module if table statistics are enabled, else None.
+
+    _table_stats keeps _stats_enabled in step with its own flag, so that
+    it (and _registry, which it uses) is imported only once statistics
+    are enabled.
+    """
+
+    if not _stats_enabled:
+        return None
+
+    import _table_stats
+    return _table_stats
+
+#------------------------------------------------------------------------------
+
+# Rule type code -> table name (first one listed for the code).
+_RULE_TYPE_NAMES = {}
+for _name, _code in _utils.RULE_TYPES_ALL.items():
+    _RULE_TYPE_NAMES.setdefault(_code, _name)
+del _name, _code
+
+def profiled_rule_type(func):
+    """Decorator for the structure importers: record per rule type."""
+
+    @functools.wraps(func)
+    def wrapper(in_, rule_type, *args, **kwargs):
+        if not _enabled:
+            return func(in_, rule_type, *args, **kwargs)
+        t = perf_counter()
+        try:
+            return func(in_, rule_type, *args, **kwargs)
+        finally:
+            record(f'{func.__name__}['
+                   f'{_RULE_TYPE_NAMES.get(rule_type, rule_type)}]',
+                   perf_counter() - t)
+
+    return wrapper
+
+#------------------------------------------------------------------------------
+
+def record_fields(fieldnames: list, seconds: list):
+    """Add the parse times of fields during the import_table being
+    profiled (called by the importers generated by _schema)."""
+
+    prefix = _method.get() + ':'
+    for fieldname, t in zip(fieldnames, seconds):
+        record(prefix + fieldname, t)
+
+#==============================================================================
+# Results.
+
+def results() -> list:
+    """Recorded entries, by decreasing total time."""
+
+    out = [{
+        'name': name,
+        'calls': calls,
+        'total_s': total,
+        'mean_s': total / calls,
+        'max_s': max_,
+    } for name, (calls, total, max_) in _records.items()]
+
+    out.sort(key=lambda entry: (-entry['total_s'], entry['name']))
+
+    return out
+
+#------------------------------------------------------------------------------
+
+def report(limit: int = None) -> str:
+    """Text report of the results, by decreasing total time."""
+
+    entries = results()[:limit]
+
+    width = max([len(e['name']) for e in entries] + [4])
+
+    lines = [f'{"name":<{width}} {"calls":>9} {"total ms":>11} '
+             f'{"mean us":>11} {"max ms":>9}']
+    for e in entries:
+        lines.append(
+            f'{e["name"]:<{width}} {e["calls"]:>9} '
+            f'{e["total_s"]*1e3:>11.3f} {e["mean_s"]*1e6:>11.1f} '
+            f'{e["max_s"]*1e3:>9.3f}')
+
+    return '\n'.join(lines)
+
+#------------------------------------------------------------------------------
+
+def to_json(**kwargs) -> str:
+    """The results as JSON (a list of entries, see results())."""
+
+    return json.dumps(results(), **kwargs)
+
+#------------------------------------------------------------------------------
+
+def _report_at_exit(target: str):
+    """Output the results of a run profiled by PARSING_PROFILE."""
+
+    if target == '1':
+        print(report(), file=sys.stderr)
+    else:
+        with open(target, 'w') as fp:
+            fp.write(to_json(indent=1))
+
+_target = os.environ.get('PARSING_PROFILE', '')
+if _target not in ('', '0'):
+    _enabled = True
+    atexit.register(_report_at_exit, _target)
+
+#==============================================================================
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Registry of the table classes: maps each .mdb table name to the module and
+class that handle it.
+
+A module is imported only when its table is first requested, so that a
+program using a few tables does not pay for importing all of them.
+
+============================================================================"""
+
+import importlib
+
+# Table name -> (module name, class name).
+
+TABLE_CLASSES = {
+    'Rules_Clitic': ('rules_clitic', 'RulesClitic'),
+    'Rules_Transfer': ('rules_transfer', 'RulesTransfer'),
+    'Rules_ComplexConcepts':
+        ('rules_complex_concepts', 'RulesComplexConcepts'),
+    'Rules_RelativizationRestructuring':
+        ('rules_relativization_restructuring',
+         'RulesRelativizationRestructuring'),
+    'Rules_NounNounRelationshipRestructuring':
+        ('rules_noun_noun_relationship_restructuring',
+         'RulesNounNounRelationshipRestructuring'),
+    'Rules_ThetaGridAdjustments':
+        ('rules_theta_grid_adjustments', 'RulesThetaGridAdjustments'),
+    'Rules_Movement': ('rules_movement', 'RulesMovement'),
+    'Rules_PronounIdentification':
+        ('rules_pronoun_identification', 'RulesPronounIdentification'),
+    'Rules_TextPreprocessing':
+        ('rules_text_preprocessing', 'RulesTextPreprocessing'),
+    'Rules_FeatureCollapsing':
+        ('rules_feature_collapsing', 'RulesFeatureCollapsing'),
+    'Rules_SpeechStyles': ('rules_speech_styles', 'RulesSpeechStyles'),
+    'Rules_TenseAspectMood':
+        ('rules_tense_aspect_mood', 'RulesTenseAspectMood'),
+    'Rules_RelativeClauses':
+        ('rules_relative_clauses', 'RulesRelativeClauses'),
+    'Rules_NounNounRelationships':
+        ('rules_noun_noun_relationships', 'RulesNounNounRelationships'),
+    'Rules_FeatureCopying': ('rules_feature_copying', 'RulesFeatureCopying'),
+    'Rules_Spellout': ('rules_spellout', 'RulesSpellout'),
+    'Rules_PronounSpellout':
+        ('rules_pronoun_spellout', 'RulesPronounSpellout'),
+    'Rules_Lexical': ('rules_lexical', 'RulesLexical'),
+    'Rules_PhraseStructure':
+        ('rules_phrase_structure', 'RulesPhraseStructure'),
+    'Rules_WordMorphophonemic':
+        ('rules_word_morphophonemic', 'RulesWordMorphophonemic'),
+    'Rules_FindReplace': ('rules_find_replace', 'RulesFindReplace'),
+    'Rules_Groups': ('rules_groups', 'RulesGroups'),
+    'CharacterFeatureValues':
+        ('character_feature_values', 'CharacterFeatureValues'),
+    'PhoneticFeatures': ('phonetic_features', 'PhoneticFeatures'),
+    'Sorting_Sequence': ('sorting_sequence', 'SortingSequence'),
+    'Features_Source': ('features_source', 'FeaturesSource'),
+    'Features_Target': ('features_target', 'FeaturesTarget'),
+    'LexicalFormNames': ('lexical_form_names', 'LexicalFormNames'),
+    'Source_UsersNouns': ('source_users_nouns', 'SourceUsersNouns'),
+    'Source_UsersAdjectives':
+        ('source_users_adjectives', 'SourceUsersAdjectives'),
+    'Source_UsersAdpositions':
+        ('source_users_adpositions', 'SourceUsersAdpositions'),
+    'Source_UsersAdverbs': ('source_users_adverbs', 'SourceUsersAdverbs'),
+    'Source_UsersConjunctions':
+        ('source_users_conjunctions', 'SourceUsersConjunctions'),
+    'Source_UsersParticles':
+        ('source_users_particles', 'SourceUsersParticles'),
+    'Source_UsersPronouns': ('source_users_pronouns', 'SourceUsersPronouns'),
+    'Source_UsersVerbs': ('source_users_verbs', 'SourceUsersVerbs'),
+    'Nouns': ('nouns', 'Nouns'),
+    'Adjectives': ('adjectives', 'Adjectives'),
+    'Adpositions': ('adpositions', 'Adpositions'),
+    'Adverbs': ('adverbs', 'Adverbs'),
+    'Conjunctions': ('conjunctions', 'Conjunctions'),
+    'Particles': ('particles', 'Particles'),
+    'Pronouns': ('pronouns', 'Pronouns'),
+    'Verbs': ('verbs', 'Verbs'),
+    'Adposition_Mappings_English':
+        ('adposition_mappings_english', 'AdpositionMappingsEnglish'),
+    'Conjunction_Mappings_English':
+        ('conjunction_mappings_english', 'ConjunctionMappingsEnglish'),
+    'Noun_Mappings_English': ('noun_mappings_english', 'NounMappingsEnglish'),
+    'Particle_Mappings_English':
+        ('particle_mappings_english', 'ParticleMappingsEnglish'),
+    'Pronoun_Mappings_English':
+        ('pronoun_mappings_english', 'PronounMappingsEnglish'),
+    'Adverb_Mappings_English':
+        ('adverb_mappings_english', 'AdverbMappingsEnglish'),
+    'Verb_Mappings_English': ('verb_mappings_english', 'VerbMappingsEnglish'),
+    'Adjective_Mappings_English':
+        ('adjective_mappings_english', 'AdjectiveMappingsEnglish'),
+    'Ontology_Adjectives': ('ontology_adjectives', 'OntologyAdjectives'),
+    'Ontology_Adpositions': ('ontology_adpositions', 'OntologyAdpositions'),
+    'Ontology_Adverbs': ('ontology_adverbs', 'OntologyAdverbs'),
+    'Ontology_Conjunctions': ('ontology_conjunctions', 'OntologyConjunctions'),
+    'Ontology_Nouns': ('ontology_nouns', 'OntologyNouns'),
+    'Ontology_Particles': ('ontology_particles', 'OntologyParticles'),
+    'Ontology_Pronouns': ('ontology_pronouns', 'OntologyPronouns'),
+    'Ontology_Verbs': ('ontology_verbs', 'OntologyVerbs'),
+    'Ontology_AdjectiveHierarchy':
+        ('ontology_adjective_hierarchy', 'OntologyAdjectiveHierarchy'),
+    'Ontology_AdpositionHierarchy':
+        ('ontology_adposition_hierarchy', 'OntologyAdpositionHierarchy'),
+    'Ontology_AdverbHierarchy':
+        ('ontology_adverb_hierarchy', 'OntologyAdverbHierarchy'),
+    'Ontology_ConjunctionHierarchy':
+        ('ontology_conjunction_hierarchy', 'OntologyConjunctionHierarchy'),
+    'Ontology_NounHierarchy':
+        ('ontology_noun_hierarchy', 'OntologyNounHierarchy'),
+    'Ontology_ParticleHierarchy':
+        ('ontology_particle_hierarchy', 'OntologyParticleHierarchy'),
+    'Ontology_PronounHierarchy':
+        ('ontology_pronoun_hierarchy', 'OntologyPronounHierarchy'),
+    'Ontology_VerbHierarchy':
+        ('ontology_verb_hierarchy', 'OntologyVerbHierarchy'),
+    'Ontology_Features_Source':
+        ('ontology_features_source', 'OntologyFeaturesSource'),
+    'Ontology_Sorting_Sequence':
+        ('ontology_sorting_sequence', 'OntologySortingSequence'),
+}
+
+ONTOLOGY_PREFIX = 'Ontology_'
+
+#------------------------------------------------------------------------------
+
+def table_names(is_ontology: bool = False) -> list:
+    """Names of the tables of a <MyLanguage>.mdb file, or of Ontology.mdb."""
+
+    return [name for name in TABLE_CLASSES
+            if name.startswith(ONTOLOGY_PREFIX) == is_ontology]
+
+#------------------------------------------------------------------------------
+
+def mdb_file_table_name(table_name: str) -> str:
+    """Name of a table in its .mdb file (Ontology tables have no prefix
+    there)."""
+
+    return table_name[len(ONTOLOGY_PREFIX):] if (
+        table_name.startswith(ONTOLOGY_PREFIX)) else table_name
+
+#------------------------------------------------------------------------------
+
+def get_table_class(table_name: str):
+    """The class handling a table (its module is imported on first use)."""
+
+    try:
+        module_name, class_name = TABLE_CLASSES[table_name]
+    except KeyError:
+        raise KeyError(f'Error: unknown table {table_name}.') from None
+
+    return getattr(importlib.import_module(module_name), class_name)
+
+#------------------------------------------------------------------------------
+
+def create_table_object(table_name: str):
+    """A new (empty) object of the class handling a table."""
+
+    return get_table_class(table_name)()
+
+#==============================================================================
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Declarative table schemas, with generated import/export code.
+
+A table class declares how each of its fields is parsed (a Codec: decode
+and encode expressions, plus an optional check on the raw string); fields
+with no codec are copied as is.  From this, straight-line functions are
+generated which convert the rows of a table to rules (dicts) and back,
+specialized for the order of the fields in the table header.  They are
+compiled the first time a header order is seen and cached.
+
+The table classes which keep their hand-written import/export code are
+those whose fields don't parse independently of each other:
+- RulesSpellout (Rules_Spellout, Rules_PronounSpellout, Rules_Lexical):
+  RuleType selects which fields are parsed and how (Simple, Morphophonemic
+  and Phrase Builder layers, infix and reduplication specs), and field
+  names vary by table (InfixParsing, TargetWord);
+- RulesFindReplace: PunctuationTable is parsed only when RuleType is 1;
+- RulesTransfer (and its subclasses Rules_ComplexConcepts, ...,
+  Rules_TextPreprocessing): OutputStructures must match InputStructures
+  in number;
+- RulesFeatureCopying: TypeOfRule (copying or setting) selects how the
+  other fields are parsed and checked, and NewName, DefaultValue and
+  DefaultCharacters must match SourceFeature in number.
+Most of their parse time goes to the structure parsers they share with
+the tables above (_input_structures, _output_structures, _spellout_tables).
+
+Usage, in a table class:
+    SCHEMA = _schema.TableSchema({
+        'Status': _schema.one_of('0', '1'),
+        'Features': _schema.split('^'),
+    })
+    ...
+    self._rules = self.SCHEMA.importer(
+        self.FIELDNAMES, self.FIELDNAMES_IMPT, table_header)(table[1:])
+    ...
+    return self.SCHEMA.exporter(self._fieldnames_order_orig)(self._rules)
+
+============================================================================"""
+
+from time import perf_counter
+
+import _utils
+import _intern
+import _profiling
+
+#==============================================================================
+
+class Codec:
+    """
+    How a field is decoded from its string, encoded back, and checked.
+
+    decode, encode and check are either None, or a Python expression in
+    which {x} stands for the value, or a function of the value.  The check
+    is asserted on the raw string, before decoding.  Other objects used by
+    the expressions are given in env, and referred to as {name}.
+    interned tells that the decoded value is already interned (by a
+    structure parser, see _intern).
+    """
+
+    def __init__(self, decode=None, encode=None, check=None, env=None,
+                 interned=False):
+        """Constructor for class."""
+
+        self.decode = decode
+        self.encode = encode
+        self.check = check
+        self.env = dict(env or {})
+        self.interned = interned
+
+#------------------------------------------------------------------------------
+
+PLAIN = Codec()
+
+def one_of(*values) -> Codec:
+    """A string field restricted to some values."""
+
+    return Codec(check='{x} in {values}', env={'values': frozenset(values)})
+
+SYNCAT = one_of(*_utils.SYNTACTIC_CATEGORIES.values())
+
+def split(sep: str) -> Codec:
+    """A list of strings joined by sep."""
+
+    return Codec(decode='{x}.split({sep})', encode='{sep}.join({x})',
+                 env={'sep': sep})
+
+def split2(sep1: str, sep2: str) -> Codec:
+    """A list of lists of strings (joined by sep2, then by sep1); an empty
+    string is an empty list."""
+
+    return Codec(
+        decode="[f.split({sep2}) if f != '' else [] "
+               "for f in {x}.split({sep1})]",
+        encode="{sep1}.join([{sep2}.join(f) if f != [] else '' "
+               "for f in {x}])",
+        env={'sep1': sep1, 'sep2': sep2})
+
+def checked(check) -> Codec:
+    """A string field with a check (expression or function)."""
+
+    return Codec(check=check)
+
+#==============================================================================
+
+class TableSchema:
+    """
+    Codecs of the fields of a table, and the import/export functions
+    generated from them (one pair per header order).
+    """
+
+    def __init__(self, codecs: dict = None):
+        """Constructor for class."""
+
+        self.codecs = dict(codecs or {})
+
+        self._importers = {}
+        self._exporters = {}
+
+#------------------------------------------------------------------------------
+
+    def importer(self, fieldnames: list, fieldnames_impt: list,
+                 header: list):
+        """Function converting rows (in the order of header) to rules.
+
+        The keys of each rule are in the order of the fieldnames not in
+        fieldnames_impt, then of fieldnames_impt (as in the hand-written
+        import_table functions).  When interning is on (see _intern), the
+        field values are interned; when profiling is on (see _profiling),
+        the function also times the fields with a codec; when table
+        statistics are on (see _table_stats), it also collects the sizes
+        of the fields.
+        """
+
+        stats = _profiling.table_stats()
+        key = (tuple(fieldnames), tuple(fieldnames_impt), tuple(header),
+               _intern._enabled, _profiling._enabled, stats)
+        func = self._importers.get(key)
+        if func is None:
+            func = self._importers[key] = self._compile_importer(*key)
+        return func
+
+#------------------------------------------------------------------------------
+
+    def exporter(self, header: list):
+        """Function converting rules to rows (in the order of header),
+        header row first."""
+
+        key = tuple(header)
+        func = self._exporters.get(key)
+        if func is None:
+            func = self._exporters[key] = self._compile_exporter(key)
+        return func
+
+#------------------------------------------------------------------------------
+
+    def _expression(self, spec, value: str, codec: Codec, role: str,
+                    j: int, env: dict) -> str:
+        """Source of the expression spec (of a codec, for field j) applied
+        to value; adds the names it needs to env."""
+
+        if callable(spec):
+            name = f'_{role}_{j}'
+            env[name] = spec
+            return f'{name}({value})'
+
+        names = {}
+        for name, obj in codec.env.items():
+            names[name] = f'_{name}_{j}'
+            env[names[name]] = obj
+
+        return '(' + spec.format(x=value, **names) + ')'
+
+#------------------------------------------------------------------------------
+
+    def _compile_importer(self, fieldnames, fieldnames_impt, header,
+                          is_interned=False, is_profiled=False, stats=None):
+        """Generate and compile the import function for a header (interning
+        the values if is_interned, with timing of the codecs if
+        is_profiled, and collecting the field sizes for the _table_stats
+        module stats if given)."""
+
+        order = [f for f in fieldnames if f not in fieldnames_impt] + [
+            f for f in fieldnames_impt]
+        position = {fieldname: j for j, fieldname in enumerate(header)}
+
+        env = {'_intern_str': _intern.intern_str,
+               '_intern_value': _intern.intern_value}
+        variables = [f'f{j}' for j in range(len(header))]
+
+        lines = [
+            'def import_rows(rows):',
+            '    out = []',
+            '    append = out.append',
+        ]
+        loop = [
+            '    for row in rows:',
+            f'        {", ".join(variables)}, = row',
+        ]
+
+        if stats is not None:
+            env['_header'] = tuple(header)
+            env['_record_field_sizes'] = stats.record_field_sizes
+            lines.append(f'    sizes = [[] for _ in range({len(header)})]')
+            lines += [f'    size{j} = sizes[{j}].append'
+                      for j in range(len(header))]
+            loop += [f'        size{j}(len({variable}))'
+                     for j, variable in enumerate(variables)]
+
+        items = []
+        timed = [] # (fieldnames of the timed codecs)
+        for fieldname in order:
+            j = position[fieldname]
+            codec = self.codecs.get(fieldname, PLAIN)
+            value = variables[j]
+            if codec.check is None and codec.decode is None:
+                if is_interned:
+                    value = f'_intern_str({value})'
+                items.append(f'{fieldname!r}: {value}')
+                continue
+            if is_profiled:
+                loop.append('        t = _perf_counter()')
+            if codec.check is not None:
+                loop.append('        assert ' + self._expression(
+                    codec.check, value, codec, 'check', j, env))
+            if codec.decode is not None:
+                value = self._expression(
+                    codec.decode, value, codec, 'decode', j, env)
+            if is_profiled:
+                loop.append(f'        v{j} = {value}')
+                loop.append(f'        seconds[{len(timed)}] += '
+                            '_perf_counter() - t')
+                value = f'v{j}'
+                timed.append(fieldname)
+            if is_interned and codec.decode is None:
+                value = f'_intern_str({value})'
+            elif is_interned and not codec.interned:
+                value = f'_intern_value({value})'
+            items.append(f'{fieldname!r}: {value}')
+
+        loop.append('        append({')
+        loop += [f'            {item},' for item in items]
+        loop.append('        })')
+
+        if is_profiled:
+            env['_perf_counter'] = perf_counter
+            env['_record_fields'] = _profiling.record_fields
+            env['_timed'] = timed
+            lines.append(f'    seconds = [0.0] * {len(timed)}')
+
+        lines += loop
+
+        if is_profiled:
+            lines.append('    _record_fields(_timed, seconds)')
+        if stats is not None:
+            lines.append('    _record_field_sizes(_header, sizes)')
+
+        lines.append('    return out')
+
+        return self._compile('\n'.join(lines), 'import_rows', env)
+
+#------------------------------------------------------------------------------
+
+    def _compile_exporter(self, header):
+        """Generate and compile the export function for a header."""
+
+        env = {'_header': list(header)}
+
+        lines = [
+            'def export_rows(rules):',
+            '    out = [list(_header)]',
+            '    append = out.append',
+            '    for rule in rules:',
+            '        append([',
+        ]
+
+        for j, fieldname in enumerate(header):
+            codec = self.codecs.get(fieldname, PLAIN)
+            value = f'rule[{fieldname!r}]'
+            if codec.encode is not None:
+                value = self._expression(
+                    codec.encode, value, codec, 'encode', j, env)
+            lines.append(f'            {value},')
+
+        lines.append('        ])')
+        lines.append('    return out')
+
+        return self._compile('\n'.join(lines), 'export_rows', env)
+
+#------------------------------------------------------------------------------
+
+    def _compile(self, source: str, name: str, env: dict):
+        """Compile the source of a function and return the function."""
+
+        namespace = dict(env)
+        exec(compile(source, f'<schema {name}>', 'exec'), namespace)
+        func = namespace[name]
+        func.source = source
+        return func
+
+#==============================================================================
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Publication of parsed tables in shared memory (or an mmapped file) for
+worker processes.
+
+The parsed tables of a language (or several) are serialized once into a
+flat buffer in which every field of every rule is addressed by offset.
+Worker processes attach to the buffer without copying or parsing it: a
+TableView gives the rules of a table as RecordViews, which decode a field
+(JSON) from the buffer when it is first read.  Starting a worker thus costs
+the decoding of a small directory, and the memory of the tables is shared
+by all of them.
+
+Buffer layout (all integers little-endian, arrays aligned to 8 bytes):
+    header:  magic, offset and length of the directory
+    per table:
+        data:          the JSON encodings of all the field values
+        field_offsets: uint64 offsets in data of each field value, then
+                       the end of data (a value ends where the next starts)
+        record_index:  uint64 index in field_offsets of the first field of
+                       each record (record order)
+        layout_ids:    uint32 layout (list of fieldnames) of each record
+    directory: JSON, with per table its state, layouts and the positions
+               of the above.
+
+Usage (publisher, e.g. before starting a process pool):
+    published = _shared_tables.publish(tables) # or write_file(tables, path)
+    ... start workers with published.name ...
+    published.close(); published.unlink()
+Usage (worker):
+    shared = _shared_tables.attach(name) # or open_file(path)
+    rules = shared['English', 'Rules_Transfer']
+    rules[3]['Status']
+
+Note: before Python 3.13, attaching to shared memory from a process that
+was not started by the publisher's multiprocessing can remove the memory
+when that process exits; use the file form in that case.
+
+============================================================================"""
+
+import os
+import mmap
+import json
+import struct
+from array import array
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+
+import _registry
+from _incremental import rules_in_record_order, set_rules_in_record_order
+
+MAGIC = b'PTSHM002'
+_HEADER = struct.Struct('<8sQQ') # magic, directory offset, length
+
+_encode = json.JSONEncoder(ensure_ascii=False, check_circular=False,
+                           separators=(',', ':')).encode
+
+#==============================================================================
+# Writing.
+
+def _align(buf: bytearray):
+    """Pad buf to a multiple of 8 bytes."""
+
+    buf += b'\0' * (-len(buf) % 8)
+
+#------------------------------------------------------------------------------
+
+def _append_table(buf: bytearray, table_object) -> dict:
+    """Append the arrays of a table to buf; returns its directory entry."""
+
+    rules = rules_in_record_order(table_object)
+
+    layouts = {}
+    data = bytearray()
+    field_offsets = array('Q')
+    record_index = array('Q')
+    layout_ids = array('I')
+
+    for rule in rules:
+        layout_ids.append(layouts.setdefault(tuple(rule), len(layouts)))
+        record_index.append(len(field_offsets))
+        for value in rule.values():
+            field_offsets.append(len(data))
+            data += _encode(value).encode('utf-8')
+    field_offsets.append(len(data))
+
+    entry = {
+        'num_rules': len(rules),
+        'state': {k: v for k, v in vars(table_object).items()
+                  if k != '_rules'},
+        'layouts': [list(layout) for layout in layouts],
+    }
+
+    for name, block in [('data', data),
+                        ('field_offsets', field_offsets.tobytes()),
+                        ('record_index', record_index.tobytes()),
+                        ('layout_ids', layout_ids.tobytes())]:
+        _align(buf)
+        entry[name] = [len(buf), len(block)]
+        buf += block
+
+    return entry
+
+#------------------------------------------------------------------------------
+
+def serialize(tables: dict) -> bytearray:
+    """Buffer of tables given as {db_name: {table_name: table object}}
+    (as returned by _mdb_pipeline.load_databases)."""
+
+    buf = bytearray(_HEADER.size)
+
+    directory = {'tables': []}
+    for db_name, table_objects in tables.items():
+        for table_name, table_object in table_objects.items():
+            assert table_object._is_set, (
+                'Error: cannot publish because table has not been set.')
+            entry = _append_table(buf, table_object)
+            directory['tables'].append(
+                {'db_name': db_name, 'table_name': table_name, **entry})
+
+    _align(buf)
+    block = _encode(directory).encode('utf-8')
+    _HEADER.pack_into(buf, 0, MAGIC, len(buf), len(block))
+    buf += block
+
+    return buf
+
+#==============================================================================
+# Views.
+
+class RecordView(Mapping):
+    """
+    Read-only view of a rule in the buffer: a field is decoded when first
+    read, and kept by the view for the next reads.
+    """
+
+    __slots__ = ('_table', '_first', '_fieldnames', '_values')
+
+    def __init__(self, table, first: int, fieldnames: dict):
+        """Constructor for class (see TableView)."""
+
+        self._table = table
+        self._first = first
+        self._fieldnames = fieldnames
+        self._values = {}
+
+    def __getitem__(self, fieldname: str):
+        values = self._values
+        if fieldname in values:
+            return values[fieldname]
+        value = values[fieldname] = self._table._decode(
+            self._first + self._fieldnames[fieldname])
+        return value
+
+    def __iter__(self):
+        return iter(self._fieldnames)
+
+    def __len__(self) -> int:
+        return len(self._fieldnames)
+
+    def __contains__(self, fieldname) -> bool:
+        return fieldname in self._fieldnames
+
+    def to_dict(self) -> dict:
+        """The whole rule (decoded anew, so a private copy)."""
+
+        decode = self._table._decode
+        return {fieldname: decode(self._first + j)
+                for fieldname, j in self._fieldnames.items()}
+
+#------------------------------------------------------------------------------
+
+class TableView:
+    """
+    Read-only view of the rules of a table in the buffer, in record order.
+    """
+
+    def __init__(self, buf: memoryview, entry: dict):
+        """Constructor for class (see SharedTables)."""
+
+        self.db_name = entry['db_name']
+        self.table_name = entry['table_name']
+        self.state = entry['state']
+        self._num_rules = entry['num_rules']
+
+        # Fieldname -> position in the record, per layout.
+        self._layouts = [{fieldname: j for j, fieldname in enumerate(layout)}
+                         for layout in entry['layouts']]
+
+        def block(name, format_=None):
+            start, length = entry[name]
+            view = buf[start:start+length]
+            return view.cast(format_) if format_ else view
+
+        self._data = block('data')
+        self._field_offsets = block('field_offsets', 'Q')
+        self._record_index = block('record_index', 'Q')
+        self._layout_ids = block('layout_ids', 'I')
+
+    def _decode(self, j: int):
+        """Decode field value number j."""
+
+        offsets = self._field_offsets
+        return json.loads(bytes(self._data[offsets[j]:offsets[j+1]]))
+
+    def __len__(self) -> int:
+        return self._num_rules
+
+    def __getitem__(self, k: int) -> RecordView:
+        if k < 0:
+            k += self._num_rules
+        if not 0 <= k < self._num_rules:
+            raise IndexError('Error: rule index out of range.')
+        return RecordView(self, self._record_index[k],
+                          self._layouts[self._layout_ids[k]])
+
+    def __iter__(self):
+        for k in range(self._num_rules):
+            yield self[k]
+
+#------------------------------------------------------------------------------
+
+    def table_object(self):
+        """A table object with all the rules decoded (a private copy)."""
+
+        table_object = _registry.create_table_object(self.table_name)
+        vars(table_object).update(json.loads(json.dumps(self.state)))
+        set_rules_in_record_order(table_object,
+                                  [record.to_dict() for record in self])
+
+        return table_object
+
+    def _release(self):
+        for view in (self._data, self._field_offsets, self._record_index,
+                     self._layout_ids):
+            view.release()
+
+#------------------------------------------------------------------------------
+
+class SharedTables:
+    """
+    The tables of a buffer, by (db_name, table_name).
+    """
+
+    def __init__(self, buf, owner=None, name: str = None):
+        """Constructor for class (see publish, attach, open_file)."""
+
+        self.name = name
+        self._owner = owner # SharedMemory or mmap
+        # The shared memory, for unlink (None for a mapped file).
+        self._shm = owner if isinstance(
+            owner, shared_memory.SharedMemory) else None
+        self._buf = memoryview(buf)
+
+        magic, offset, length = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError('Error: not a buffer of parsed tables.')
+        directory = json.loads(bytes(self._buf[offset:offset+length]))
+
+        self._tables = {}
+        for entry in directory['tables']:
+            self._tables[entry['db_name'], entry['table_name']] = (
+                TableView(self._buf, entry))
+
+    def __getitem__(self, key: tuple) -> TableView:
+        return self._tables[key]
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._tables
+
+    def keys(self) -> list:
+        """The (db_name, table_name) of the tables."""
+
+        return list(self._tables)
+
+#------------------------------------------------------------------------------
+
+    def close(self):
+        """Detach from the buffer (views of it can no longer be used)."""
+
+        for table in self._tables.values():
+            table._release()
+        self._tables = {}
+        self._buf.release()
+        if self._owner is not None:
+            self._owner.close()
+            self._owner = None
+
+    def unlink(self):
+        """Free the shared memory, or remove the file of open_file
+        (publisher only, once workers are done)."""
+
+        if self._shm is not None:
+            self._shm.unlink()
+        else:
+            os.remove(self.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+#==============================================================================
+# Publication and attachment.
+
+def publish(tables: dict, name: str = None) -> SharedTables:
+    """Serialize tables into a new shared memory block (its name is in the
+    .name of the result, for attach)."""
+
+    buf = serialize(tables)
+
+    shm = shared_memory.SharedMemory(name=name, create=True, size=len(buf))
+    shm.buf[:len(buf)] = buf
+
+    return SharedTables(shm.buf, shm, shm.name)
+
+#------------------------------------------------------------------------------
+
+def attach(name: str) -> SharedTables:
+    """Attach to tables published by publish."""
+
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError: # before Python 3.13
+        shm = shared_memory.SharedMemory(name=name)
+
+    return SharedTables(shm.buf, shm, name)
+
+#------------------------------------------------------------------------------
+
+def write_file(tables: dict, path: str):
+    """Serialize tables into a file (for open_file)."""
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as fp:
+        fp.write(serialize(tables))
+    os.replace(tmp_path, path)
+
+#------------------------------------------------------------------------------
+
+def open_file(path: str) -> SharedTables:
+    """Map a file written by write_file (read-only, shared by all the
+    processes mapping it)."""
+
+    with open(path, 'rb') as fp:
+        mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return SharedTables(mm, mm, path)
+
+#==============================================================================
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Immutable snapshots of parsed tables, for lock-free reads by many threads.
+
+freeze(table_object) converts a loaded table into a TableSnapshot: its
+rules (in record order) are deeply immutable, lists becoming tuples and
+dicts (rules, constituents) read-only mappings (types.MappingProxyType
+over a private dict), so rule['Status'] etc. still work.  Objects shared
+in the table (e.g. the structures shared by _structure_memo, when it is
+enabled) are frozen once and stay shared in the snapshot.  Nothing in a
+snapshot can change, so any number of threads can read it without locks
+or defensive copies.
+
+thaw() gives back a mutable table object (a copy), e.g. to edit and
+export it.
+
+A SnapshotHolder publishes the current snapshot (or any immutable
+object, e.g. the result of freeze_tables); reload builds a new one and
+swaps it in atomically.  Readers take holder.current once per unit of
+work and keep using that snapshot even if a reload happens meanwhile:
+
+    holder = _snapshot.SnapshotHolder(_snapshot.freeze_tables(tables))
+    ...
+    tables = holder.current # in a worker thread
+    ...
+    holder.reload(lambda: _snapshot.freeze_tables(load_tables()))
+
+============================================================================"""
+
+import threading
+from types import MappingProxyType
+
+from _incremental import rules_in_record_order, set_rules_in_record_order
+
+#==============================================================================
+
+def _freeze(obj, memo: dict):
+    """Deeply immutable version of obj; memo (id -> (obj, frozen)) keeps
+    shared objects shared.  (obj is kept in memo so that its id is not
+    reused, e.g. by a temporary list, while memo is in use.)"""
+
+    if isinstance(obj, (list, dict)):
+        entry = memo.get(id(obj))
+        if entry is None:
+            if isinstance(obj, list):
+                frozen = tuple([_freeze(value, memo) for value in obj])
+            else:
+                frozen = MappingProxyType(
+                    {key: _freeze(value, memo) for key, value in obj.items()})
+            entry = memo[id(obj)] = (obj, frozen)
+        return entry[1]
+
+    return obj
+
+#------------------------------------------------------------------------------
+
+def _thaw(obj):
+    """Mutable (list/dict) copy of a frozen object."""
+
+    if isinstance(obj, tuple):
+        return [_thaw(value) for value in obj]
+
+    if isinstance(obj, MappingProxyType):
+        return {key: _thaw(value) for key, value in obj.items()}
+
+    return obj
+
+#==============================================================================
+
+class TableSnapshot:
+    """
+    Immutable snapshot of a parsed table.
+
+    rules: tuple of the rules, in record order (read-only mappings).
+    state: read-only mapping of the other attributes of the table object
+           (e.g. _fieldnames_order_orig).
+    """
+
+    __slots__ = ('table_class', 'rules', 'state', '_by_id')
+
+    def __init__(self, table_class, rules: tuple, state: MappingProxyType):
+        """Constructor for class (see freeze)."""
+
+        set_ = object.__setattr__
+        set_(self, 'table_class', table_class)
+        set_(self, 'rules', rules)
+        set_(self, 'state', state)
+        set_(self, '_by_id', MappingProxyType(
+            {rule['ID']: rule for rule in rules if 'ID' in rule}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Error: a snapshot is immutable.')
+
+    def __delattr__(self, name):
+        raise AttributeError('Error: a snapshot is immutable.')
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __getitem__(self, i: int):
+        return self.rules[i]
+
+#------------------------------------------------------------------------------
+
+    def by_id(self, rule_id: str):
+        """The rule with a given ID (None if none)."""
+
+        return self._by_id.get(rule_id)
+
+#------------------------------------------------------------------------------
+
+    def thaw(self):
+        """A mutable table object (a copy) with the rules of the snapshot."""
+
+        table_object = self.table_class()
+        vars(table_object).update(_thaw(self.state))
+        set_rules_in_record_order(table_object, _thaw(self.rules))
+
+        return table_object
+
+#------------------------------------------------------------------------------
+
+    def export_table(self) -> list:
+        """Convert the snapshot back into string form (see export_table of
+        the table classes)."""
+
+        return self.thaw().export_table()
+
+#==============================================================================
+
+def freeze(table_object) -> TableSnapshot:
+    """Immutable snapshot of a loaded table object."""
+
+    assert table_object._is_set, (
+        'Error: cannot freeze because table has not been set.')
+
+    memo = {}
+
+    rules = _freeze(rules_in_record_order(table_object), memo)
+    state = _freeze({k: v for k, v in vars(table_object).items()
+                     if k != '_rules'}, memo)
+
+    return TableSnapshot(type(table_object), rules, state)
+
+#------------------------------------------------------------------------------
+
+def freeze_tables(tables: dict) -> MappingProxyType:
+    """Snapshots of tables given as {db_name: {table_name: table object}}
+    (as returned by _mdb_pipeline.load_databases), in read-only mappings."""
+
+    return MappingProxyType({
+        db_name: MappingProxyType({
+            table_name: freeze(table_object)
+            for table_name, table_object in table_objects.items()})
+        for db_name, table_objects in tables.items()})
+
+#==============================================================================
+
+class SnapshotHolder:
+    """
+    Holder of the current snapshot, swapped atomically on reload.
+
+    Reading current takes no lock; writers (swap, reload) are serialized,
+    and reloads are serialized with each other, so that a slow load cannot
+    publish its (older) snapshot over that of a later reload.
+    """
+
+    def __init__(self, snapshot=None):
+        """Constructor for class."""
+
+        self._current = snapshot
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+    @property
+    def current(self):
+        """The current snapshot."""
+
+        return self._current
+
+#------------------------------------------------------------------------------
+
+    def swap(self, snapshot):
+        """Publish a new snapshot; returns the previous one."""
+
+        with self._lock:
+            previous, self._current = self._current, snapshot
+
+        return previous
+
+#------------------------------------------------------------------------------
+
+    def reload(self, load):
+        """Build a new snapshot with load() and publish it; returns the
+        previous one.  Readers and swap are not blocked meanwhile (load runs
+        outside their lock), other reloads wait."""
+
+        with self._reload_lock:
+            return self.swap(load())
+
+#==============================================================================
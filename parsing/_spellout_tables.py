@@ -21,6 +21,9 @@ import sys
 import re
 
 import _utils
+import _intern
+import _profiling
+import _structure_memo
 from _input_structures import *
 from _output_structures import *
 
@@ -160,10 +163,16 @@ def import_spellout_table(in_: str, rule_type: int, rule_subtype: int) -> list:
     out.append([col_widths, col_names, col_features,
                 table_entries, table_entry_comments])
 
+    # Share equal strings between table cells (and rules).
+    if _intern._enabled:
+        _intern.intern_rule(out)
+
     return out
 
 #------------------------------------------------------------------------------
 
+@_profiling.profiled_rule_type
+@_structure_memo.memoized
 def import_spellout_tables(in_: str, rule_type: int, rule_subtype: int) -> list:
     """Do import_spellout_table for a string with muliple tables."""
 
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Export of parsed tables to a SQLite database, and import back from it.
+
+Every parsed table (of every language database) is stored as:
+- parsed_tables: one row per table, with the state of the table object
+  (header order, field names, permutation, ...) as JSON;
+- rules: one row per rule, in record order, with the parsed rule as JSON
+  (query any field with json_extract(rule, '$.Comment')) and its
+  ID, SyntacticCategory, Status and EntryID as columns;
+- trigger_words: the words of TriggerWord/TriggerWords/TargetWord, one
+  row per word;
+- constituents: the constituents of InputStructures/OutputStructures
+  (and of the structures in Phrase Builder spellout layers), one row
+  per constituent;
+- spellout_cells: the cells of the spellout tables (RulesParsing of
+  Rules_Spellout etc.), one row per cell, with its row and column names.
+Indexes are on syncat, status, trigger words and entry ids.
+
+The child tables are for queries only; import_tables rebuilds the table
+objects from parsed_tables and rules alone, which is much faster than
+parsing the CSV again.
+
+Usage:
+    tables = _mdb_pipeline.load_databases(mdb_dir, ['English', 'Ontology'])
+    _sqlite_store.export_tables('parsed.sqlite', tables)
+    ...
+    tables = _sqlite_store.import_tables('parsed.sqlite')
+
+============================================================================"""
+
+import json
+import sqlite3
+
+import _intern
+import _registry
+
+# Version of the database layout (PRAGMA user_version).
+SCHEMA_VERSION = 1
+
+_TABLES_SQL = '''
+CREATE TABLE IF NOT EXISTS parsed_tables (
+    db_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    num_rules INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (db_name, table_name)
+);
+CREATE TABLE IF NOT EXISTS rules (
+    db_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    rule_index INTEGER NOT NULL,
+    id TEXT,
+    syntactic_category TEXT,
+    status TEXT,
+    entry_id TEXT,
+    rule TEXT NOT NULL,
+    PRIMARY KEY (db_name, table_name, rule_index)
+);
+CREATE TABLE IF NOT EXISTS trigger_words (
+    db_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    rule_index INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    word TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS constituents (
+    db_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    rule_index INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    layer INTEGER,
+    layer_row INTEGER,
+    structure_index INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    modifier TEXT,
+    syncat TEXT,
+    words TEXT,
+    features TEXT,
+    target TEXT
+);
+CREATE TABLE IF NOT EXISTS spellout_cells (
+    db_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    rule_index INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    layer INTEGER NOT NULL,
+    layer_name TEXT,
+    row INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    row_name TEXT,
+    col_name TEXT,
+    entry TEXT,
+    comment TEXT
+);
+'''
+
+_INDEXES_SQL = '''
+CREATE INDEX IF NOT EXISTS rules_id ON rules (db_name, table_name, id);
+CREATE INDEX IF NOT EXISTS rules_syncat ON rules (syntactic_category);
+CREATE INDEX IF NOT EXISTS rules_status ON rules (status);
+CREATE INDEX IF NOT EXISTS rules_entry_id ON rules (entry_id);
+CREATE INDEX IF NOT EXISTS trigger_words_word ON trigger_words (word);
+CREATE INDEX IF NOT EXISTS trigger_words_rule
+    ON trigger_words (db_name, table_name, rule_index);
+CREATE INDEX IF NOT EXISTS constituents_syncat ON constituents (syncat);
+CREATE INDEX IF NOT EXISTS constituents_rule
+    ON constituents (db_name, table_name, rule_index);
+CREATE INDEX IF NOT EXISTS spellout_cells_entry ON spellout_cells (entry);
+CREATE INDEX IF NOT EXISTS spellout_cells_rule
+    ON spellout_cells (db_name, table_name, rule_index);
+'''
+
+_CHILD_TABLES = ['rules', 'trigger_words', 'constituents', 'spellout_cells']
+
+# Fields of the rules holding trigger words / structures / spellout tables.
+TRIGGER_WORD_FIELDS = ['TriggerWord', 'TriggerWords', 'TargetWord']
+STRUCTURE_FIELDS = ['InputStructures', 'OutputStructures', 'Structure']
+SPELLOUT_TABLE_FIELDS = ['RulesParsing']
+
+#==============================================================================
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open (or create) a database, creating its tables if needed."""
+
+    conn = sqlite3.connect(path)
+
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    if version not in (0, SCHEMA_VERSION):
+        conn.close()
+        raise ValueError(f'Error: {path} has layout version {version}, '
+                         f'expected {SCHEMA_VERSION}.')
+
+    conn.executescript(_TABLES_SQL)
+    conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    return conn
+
+#------------------------------------------------------------------------------
+
+def create_indexes(conn: sqlite3.Connection):
+    """Create the indexes (done after a bulk export, which is faster than
+    maintaining them during it)."""
+
+    conn.executescript(_INDEXES_SQL)
+
+#==============================================================================
+# Rows of the child tables.
+
+def _rules_in_record_order(table_object) -> list:
+    """The rules of a table object in the order of the records (see
+    _incremental)."""
+
+    iperm = getattr(table_object, '_iperm', None)
+    if iperm is None:
+        return table_object._rules
+
+    return [table_object._rules[k] for k in iperm]
+
+#------------------------------------------------------------------------------
+
+def _trigger_words(field) -> list:
+    """The words of a trigger word field: a comma-separated string
+    (optionally starting with "." for excluded words), or as parsed by
+    Rules_WordMorphophonemic ([is_excluded, word, ...]) or by the spellout
+    classes ([[word, ...], is_excluded])."""
+
+    if isinstance(field, list):
+        words = [w for w in field if isinstance(w, str)] + [
+            w for f in field if isinstance(f, list) for w in f]
+    else:
+        words = (field[1:] if field[:1] == '.' else field).split(',')
+
+    return [w for w in words if w != '']
+
+#------------------------------------------------------------------------------
+
+def _structure_constituents(structure) -> list:
+    """The constituent dicts of one parsed structure (see
+    _input_structures / _output_structures)."""
+
+    # Structure with a comment, or with the locations of Rules_FeatureCopying.
+    if structure and isinstance(structure[0], str) and (
+        isinstance(structure[-1], list)):
+        structure = structure[-1]
+
+    return [elt for elt in structure if isinstance(elt, dict)]
+
+#------------------------------------------------------------------------------
+
+def _constituent_values(elt: dict) -> tuple:
+    """(kind, modifier, syncat, words, features, target) of a
+    constituent."""
+
+    if 'InputFeatures' in elt:
+        kind = 'input'
+        words, features, target = (elt['InputSourceWords'],
+            elt['InputFeatures'], elt['InputTargetWords'])
+    else:
+        kind = 'output'
+        words, features, target = elt['w2'], elt['f2'], elt['r']
+
+    # Syncat character of e.g. "N-abc".
+    syncat = features[0] if features[1:2] == '-' else None
+
+    return kind, elt['modifier'], syncat, words, features, target
+
+#------------------------------------------------------------------------------
+
+def _structures_rows(structures, key: tuple, field: str, layer=None,
+                     layer_row=None):
+    """Rows of constituents for a list of parsed structures (with the
+    final crlf flag)."""
+
+    if not isinstance(structures, list):
+        return
+
+    for s, structure in enumerate(structures):
+        if not isinstance(structure, list):
+            continue # final crlf flag
+        for p, elt in enumerate(_structure_constituents(structure)):
+            yield key + (field, layer, layer_row, s, p) + (
+                _constituent_values(elt))
+
+#------------------------------------------------------------------------------
+
+def _is_spellout_tables(value) -> bool:
+    """Is a parsed field the result of import_spellout_tables."""
+
+    return isinstance(value, list) and value != [] and all(
+        isinstance(layer, list) and (layer == [] or (
+            isinstance(layer[-1], list) and len(layer[-1]) == 5))
+        for layer in value)
+
+#------------------------------------------------------------------------------
+
+def _spellout_rows(layers: list, key: tuple, field: str):
+    """Rows of constituents (of Phrase Builder layers) and of cells for the
+    parsed spellout tables of a rule; yields (is_cell, row)."""
+
+    for l, layer in enumerate(layers):
+
+        if layer == []:
+            continue
+
+        # Title part and row descriptors (layer_row -1 for the title).
+        descriptors = [layer[0]] + layer[2:-1]
+        for r, (name, info) in enumerate(descriptors):
+            # Phrase Builder: [input structures, output structures].
+            if isinstance(info, list):
+                for structures in info:
+                    for row in _structures_rows(
+                        structures, key, field, l, r - 1):
+                        yield False, row
+
+        num_row, num_col = int(layer[1][0]), int(layer[1][1])
+        col_widths, col_names, col_features, entries, comments = layer[-1]
+        row_names = [name for name, _ in layer[2:-1]]
+
+        for i in range(num_row):
+            for j in range(num_col):
+                k = i * num_col + j
+                yield True, key + (field, l, layer[0][0], i, j,
+                    row_names[i] if i < len(row_names) else None,
+                    col_names[j], entries[k],
+                    comments[k] if k < len(comments) - 1 else None)
+
+#==============================================================================
+# Export.
+
+def export_table(conn: sqlite3.Connection, db_name: str, table_name: str,
+                 table_object):
+    """Write one parsed table (replacing it if already there), in one
+    transaction.
+
+    The indexes are not created here; see export_tables and
+    create_indexes.
+    """
+
+    assert table_object._is_set, (
+        'Error: cannot export because table has not been set.')
+
+    rules = _rules_in_record_order(table_object)
+
+    state = {k: v for k, v in vars(table_object).items() if k != '_rules'}
+
+    dumps = json.JSONEncoder(ensure_ascii=False, check_circular=False,
+                             separators=(',', ':')).encode
+
+    rule_rows = []
+    trigger_rows = []
+    constituent_rows = []
+    cell_rows = []
+
+    for i, rule in enumerate(rules):
+
+        key = (db_name, table_name, i)
+
+        rule_rows.append(key + (rule.get('ID'),
+            rule.get('SyntacticCategory'), rule.get('Status'),
+            rule.get('EntryID'), dumps(rule)))
+
+        for field in TRIGGER_WORD_FIELDS:
+            if field in rule:
+                trigger_rows += [key + (field, word)
+                                 for word in _trigger_words(rule[field])]
+
+        for field in STRUCTURE_FIELDS:
+            if field in rule:
+                constituent_rows += _structures_rows(rule[field], key, field)
+
+        for field in SPELLOUT_TABLE_FIELDS:
+            if _is_spellout_tables(rule.get(field)):
+                for is_cell, row in _spellout_rows(rule[field], key, field):
+                    (cell_rows if is_cell else constituent_rows).append(row)
+
+    with conn:
+        for name in _CHILD_TABLES + ['parsed_tables']:
+            conn.execute(f'DELETE FROM {name} '
+                         f'WHERE db_name = ? AND table_name = ?',
+                         (db_name, table_name))
+
+        conn.execute('INSERT INTO parsed_tables VALUES (?, ?, ?, ?)',
+                     (db_name, table_name, len(rules), dumps(state)))
+        conn.executemany('INSERT INTO rules VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                         rule_rows)
+        conn.executemany('INSERT INTO trigger_words VALUES (?, ?, ?, ?, ?)',
+                         trigger_rows)
+        conn.executemany('INSERT INTO constituents VALUES '
+                         '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                         constituent_rows)
+        conn.executemany('INSERT INTO spellout_cells VALUES '
+                         '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                         cell_rows)
+
+#------------------------------------------------------------------------------
+
+def export_tables(path: str, tables: dict):
+    """Write parsed tables, given as {db_name: {table_name: table object}}
+    (as returned by _mdb_pipeline.load_databases), then index them."""
+
+    conn = connect(path)
+    try:
+        for db_name, table_objects in tables.items():
+            for table_name, table_object in table_objects.items():
+                export_table(conn, db_name, table_name, table_object)
+        create_indexes(conn)
+    finally:
+        conn.close()
+
+#==============================================================================
+# Import.
+
+def import_table(conn: sqlite3.Connection, db_name: str, table_name: str,
+                 intern_strings: bool = None):
+    """Rebuild the table object of one table (without parsing).
+
+    Interning the strings of the rules (see _intern) takes about half of
+    the time, and would make loading slower than parsing the CSV files;
+    intern_strings defaults to whether interning is enabled (off unless
+    configured).
+    """
+
+    if intern_strings is None:
+        intern_strings = _intern.is_enabled()
+
+    row = conn.execute('SELECT num_rules, state FROM parsed_tables '
+                       'WHERE db_name = ? AND table_name = ?',
+                       (db_name, table_name)).fetchone()
+    if row is None:
+        raise KeyError(f'Error: no table {db_name}/{table_name}.')
+    num_rules, state = row
+
+    # One json.loads for all the rules of the table.
+    texts = [text for text, in conn.execute(
+        'SELECT rule FROM rules WHERE db_name = ? AND table_name = ? '
+        'ORDER BY rule_index', (db_name, table_name))]
+    assert len(texts) == num_rules, (
+        f'Error: {db_name}/{table_name} has {len(texts)} rules, '
+        f'expected {num_rules}.')
+    rules = json.loads('[' + ','.join(texts) + ']')
+    if intern_strings:
+        _intern.intern_rule(rules)
+
+    table_object = _registry.create_table_object(table_name)
+    vars(table_object).update(json.loads(state))
+
+    # Sorted by ID for the classes that have a permutation.
+    perm = getattr(table_object, '_perm', None)
+    table_object._rules = rules if perm is None else [rules[k] for k in perm]
+
+    return table_object
+
+#------------------------------------------------------------------------------
+
+def import_tables(path: str, db_names: list = None,
+                  table_names: list = None,
+                  intern_strings: bool = None) -> dict:
+    """Rebuild table objects from a database written by export_tables;
+    returns {db_name: {table_name: table object}}.
+
+    db_names and table_names restrict the tables (default: all).
+    """
+
+    conn = sqlite3.connect(path)
+    try:
+        out = {}
+        for db_name, table_name in conn.execute(
+            'SELECT db_name, table_name FROM parsed_tables').fetchall():
+            if db_names is not None and db_name not in db_names:
+                continue
+            if table_names is not None and table_name not in table_names:
+                continue
+            out.setdefault(db_name, {})[table_name] = import_table(
+                conn, db_name, table_name, intern_strings)
+    finally:
+        conn.close()
+
+    return out
+
+#==============================================================================
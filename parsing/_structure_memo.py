@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Opt-in LRU memoization of structure parsing.
+
+Many rules carry identical InputStructures/OutputStructures strings (they
+are copied between rules in the GUI), and Phrase Builder layers repeat
+embedded structures.  When enabled, import_input_structures,
+import_output_structures and import_spellout_tables are memoized on
+(string, rule_type[, subtype]), keeping at most maxsize results per
+function, least recently used first out.
+
+Memoization is off by default, so that parsed tables hold plain, mutable
+lists and dicts.  It is enabled by configure(maxsize) (e.g. configure(
+DEFAULT_MAXSIZE)), or for the whole run by the environment variable
+PARSING_MEMO (its value is the maxsize; "1" for DEFAULT_MAXSIZE).
+
+When enabled, a memoized result is shared by all the rules with the same
+string, so it is made read-only: its lists and dicts are FrozenList and
+FrozenDict, which are list and dict in every other respect (comparison,
+iteration, JSON, pickling) but raise TypeError when modified.  Copying is
+the way to write (copy-on-write): copy.copy/copy.deepcopy of them give
+plain lists and dicts, and writable(rule, fieldname) replaces a field of
+a rule by such a copy before it is modified:
+
+    structures = _structure_memo.writable(rule, 'InputStructures')
+    structures[0][0]['InputFeatures'] = 'N-'
+
+Statistics (hits, misses, evictions, hit rate) are given by stats().
+
+============================================================================"""
+
+import os
+import copy
+import functools
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 4096
+
+def _initial_maxsize() -> int:
+    """The maxsize set by PARSING_MEMO (0: disabled)."""
+
+    value = os.environ.get('PARSING_MEMO', '')
+    if value in ('', '0'):
+        return 0
+    return DEFAULT_MAXSIZE if value == '1' else int(value)
+
+_MAXSIZE = _initial_maxsize()
+
+_READ_ONLY_MESSAGE = ('Error: shared parse result is read-only; '
+                      'use _structure_memo.writable() or copy it first.')
+
+#==============================================================================
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(_READ_ONLY_MESSAGE)
+
+#------------------------------------------------------------------------------
+
+class FrozenList(list):
+    """
+    Read-only list of a shared parse result.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = _read_only
+    sort = reverse = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+#------------------------------------------------------------------------------
+
+class FrozenDict(dict):
+    """
+    Read-only dict of a shared parse result.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo)
+                for key, value in self.items()}
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+#------------------------------------------------------------------------------
+
+def freeze(obj):
+    """Read-only version of a parse result (nested lists and dicts)."""
+
+    if type(obj) is list:
+        return FrozenList([freeze(value) for value in obj])
+
+    if type(obj) is dict:
+        return FrozenDict({key: freeze(value) for key, value in obj.items()})
+
+    return obj
+
+#------------------------------------------------------------------------------
+
+def is_frozen(obj) -> bool:
+    """Whether obj is (part of) a shared, read-only parse result."""
+
+    return isinstance(obj, (FrozenList, FrozenDict))
+
+#------------------------------------------------------------------------------
+
+def writable(rule: dict, fieldname: str):
+    """Make a field of a rule writable: if it is a shared parse result, it is
+    replaced by a (deep) copy of it.  Returns the field value."""
+
+    value = rule[fieldname]
+
+    if is_frozen(value):
+        value = rule[fieldname] = copy.deepcopy(value)
+
+    return value
+
+#==============================================================================
+
+class _Memo:
+    """LRU cache of one function."""
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        calls = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / calls if calls else 0.0,
+            'currsize': len(self.cache),
+            'maxsize': self.maxsize,
+        }
+
+_memos = {}
+
+#------------------------------------------------------------------------------
+
+def memoized(func):
+    """Decorator for the structure importers: func(in_, rule_type[,
+    rule_subtype]) -> parse result, memoized as a read-only result."""
+
+    memo = _memos[func.__name__] = _Memo(func.__name__, _MAXSIZE)
+
+    @functools.wraps(func)
+    def wrapper(in_: str, rule_type: int, *args, **kwargs):
+
+        if memo.maxsize <= 0:
+            return func(in_, rule_type, *args, **kwargs)
+
+        key = (in_, rule_type, args, tuple(kwargs.items()))
+        cache = memo.cache
+
+        result = cache.get(key)
+        if result is not None:
+            memo.hits += 1
+            cache.move_to_end(key)
+            return result
+
+        memo.misses += 1
+        result = cache[key] = freeze(func(in_, rule_type, *args, **kwargs))
+        if len(cache) > memo.maxsize:
+            cache.popitem(last=False)
+            memo.evictions += 1
+
+        return result
+
+    return wrapper
+
+#------------------------------------------------------------------------------
+
+def configure(maxsize: int = DEFAULT_MAXSIZE):
+    """Enable memoization with caches of a given size (0 disables it);
+    empties them."""
+
+    for memo in _memos.values():
+        memo.maxsize = maxsize
+        memo.clear()
+
+#------------------------------------------------------------------------------
+
+def clear():
+    """Empty the caches and reset the statistics."""
+
+    for memo in _memos.values():
+        memo.clear()
+
+#------------------------------------------------------------------------------
+
+def stats() -> dict:
+    """Statistics of each memoized function, by function name."""
+
+    return {name: memo.stats() for name, memo in _memos.items()}
+
+#==============================================================================
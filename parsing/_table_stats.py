@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Opt-in statistics of the parsed tables: sizes and shapes, per database and
+table, for capacity planning.
+
+Recorded for each table when it is imported (import_table):
+- the number of rules and the size (characters) of the table;
+- the size distribution of each field (characters of the field string);
+- structures (InputStructures, OutputStructures, Structure, and those of
+  Phrase Builder layers) per rule, and constituents per structure;
+- spellout layers (RulesParsing tables) per rule, and rows and columns
+  per layer.
+A distribution gives count, total, mean, min, max and a histogram by
+powers of two.  The field sizes of the tables using _schema are collected
+by their importers, while parsing; for the other tables, and for the
+structures and layers, this takes a pass over the rows or the parsed
+rules after the parse.
+
+The import_table instrumentation (see _profiling) imports this module
+only when statistics are requested, so that it costs nothing otherwise;
+the flag it tests (_profiling._stats_enabled) is set by _set_enabled.
+
+The database of a table is the one set by database() around its import
+(a context variable, so concurrent imports, e.g. by _mdb_pipeline, are
+attributed correctly).
+
+Statistics are enabled either for the whole run by the environment
+variable PARSING_STATS (a text report is then printed to stderr at exit;
+if the value is not "1", it is taken as the path of a JSON file to write
+the results to), or for a block of code by the context manager
+collecting():
+
+    with _table_stats.collecting(), _table_stats.database('English'):
+        table_object.import_table(table)
+    print(_table_stats.report())
+
+When disabled, an import costs one flag test.
+
+============================================================================"""
+
+import os
+import sys
+import json
+import atexit
+import contextlib
+import contextvars
+from bisect import bisect_right
+
+import _registry
+import _profiling
+
+_enabled = False
+
+# Database of the tables being imported.
+_database = contextvars.ContextVar('database', default='')
+
+# (db_name, table_name) -> TableStats
+_records = {}
+
+# (header, field sizes) collected by the importer of the table being
+# imported (see record_field_sizes).
+_field_sizes = contextvars.ContextVar('field_sizes', default=None)
+
+# Fields holding InputStructures/OutputStructures, and spellout layers.
+STRUCTURES_FIELDNAMES = ('InputStructures', 'OutputStructures', 'Structure')
+LAYERS_FIELDNAMES = ('RulesParsing',)
+
+#------------------------------------------------------------------------------
+
+def is_enabled() -> bool:
+    """Whether statistics are currently collected."""
+
+    return _enabled
+
+#------------------------------------------------------------------------------
+
+def _set_enabled(enabled: bool):
+    """Enable or disable statistics, here and in _profiling."""
+
+    global _enabled
+    _enabled = _profiling._stats_enabled = enabled
+
+#------------------------------------------------------------------------------
+
+def reset():
+    """Discard all recorded results."""
+
+    _records.clear()
+
+#------------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def collecting(reset_results: bool = True):
+    """Enable statistics within a with block."""
+
+    if reset_results:
+        reset()
+
+    previous = _enabled
+    _set_enabled(True)
+    try:
+        yield
+    finally:
+        _set_enabled(previous)
+
+#------------------------------------------------------------------------------
+
+def enable():
+    """Enable statistics (until disable)."""
+
+    _set_enabled(True)
+
+def disable():
+    """Disable statistics (the results are kept)."""
+
+    _set_enabled(False)
+
+#------------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def database(db_name: str):
+    """Attribute the tables imported within a with block to a database."""
+
+    token = _database.set(db_name)
+    try:
+        yield
+    finally:
+        _database.reset(token)
+
+#==============================================================================
+
+class Distribution:
+    """
+    Count, total, min, max and power-of-two histogram of integer values.
+    """
+
+    __slots__ = ('count', 'total', 'min', 'max', '_buckets')
+
+    def __init__(self):
+        """Constructor for class."""
+
+        self.count = self.total = 0
+        self.min = self.max = None
+        # Bucket b counts the values of bit length b: 0, 1, 2-3, 4-7, ...
+        self._buckets = []
+
+    def add(self, value: int):
+        """Add one value."""
+
+        self.add_all([value])
+
+    def add_all(self, values: list):
+        """Add values (much faster than add for each)."""
+
+        if not values:
+            return
+
+        values = sorted(values)
+        low, high = values[0], values[-1]
+
+        self.count += len(values)
+        self.total += sum(values)
+        if self.min is None or low < self.min:
+            self.min = low
+        if self.max is None or high > self.max:
+            self.max = high
+
+        buckets = self._buckets
+        if high.bit_length() >= len(buckets):
+            buckets.extend([0] * (high.bit_length() + 1 - len(buckets)))
+        # Bucket boundaries in the sorted values.
+        start = 0
+        for b in range(low.bit_length(), high.bit_length() + 1):
+            end = bisect_right(values, (1 << b) - 1, start)
+            buckets[b] += end - start
+            start = end
+
+    def to_dict(self) -> dict:
+        """The distribution; the histogram maps the upper bound of each
+        (non-empty) bucket to its count."""
+
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min,
+            'max': self.max,
+            'histogram': {(1 << b) - 1: n
+                          for b, n in enumerate(self._buckets) if n},
+        }
+
+#------------------------------------------------------------------------------
+
+def _constituents(structure: list) -> list:
+    """The constituents of a parsed structure: a list of constituent dicts
+    (or of strings, for the spellout output structures), possibly preceded
+    by a comment or by source and destination locations."""
+
+    if structure and isinstance(structure[0], str) and (
+        isinstance(structure[-1], list)):
+        return structure[-1]
+
+    return structure
+
+#------------------------------------------------------------------------------
+
+class TableStats:
+    """
+    Statistics of a table (accumulated over its imports).
+    """
+
+    def __init__(self, db_name: str, table_name: str):
+        """Constructor for class."""
+
+        self.db_name = db_name
+        self.table_name = table_name
+        self.imports = 0
+        self.rules = 0
+        self.size = 0
+        self.fields = {}
+        self.structures_per_rule = Distribution()
+        self.constituents_per_structure = Distribution()
+        self.layers_per_rule = Distribution()
+        self.rows_per_layer = Distribution()
+        self.cols_per_layer = Distribution()
+
+#------------------------------------------------------------------------------
+
+    def add_rows(self, table: list):
+        """Field sizes of the rows of a table (header first)."""
+
+        if not table:
+            return
+
+        self.add_field_sizes(table[0], [list(map(len, column))
+                                        for column in zip(*table[1:])])
+
+#------------------------------------------------------------------------------
+
+    def add_field_sizes(self, fieldnames: list, sizes: list):
+        """Field sizes, given as the list of sizes of each field."""
+
+        for fieldname, field_sizes in zip(fieldnames, sizes):
+            self.fields.setdefault(fieldname, Distribution()).add_all(
+                field_sizes)
+            self.size += sum(field_sizes)
+
+#------------------------------------------------------------------------------
+
+    def add_rules(self, rules: list, fieldnames: list):
+        """Shapes of the parsed rules of a table with the given fields."""
+
+        self.rules += len(rules)
+
+        structures_fieldnames = [f for f in STRUCTURES_FIELDNAMES
+                                 if f in fieldnames]
+        layers_fieldnames = [f for f in LAYERS_FIELDNAMES if f in fieldnames]
+        if not structures_fieldnames and not layers_fieldnames:
+            return
+
+        # Values, added at the end (see Distribution.add_all).
+        structures_per_rule = []
+        constituents = []
+        layers_per_rule = []
+        rows = []
+        cols = []
+
+        def add_structures(structures: list) -> int:
+            n = 0
+            for structure in structures:
+                if isinstance(structure, list): # (not the final-CR flag)
+                    constituents.append(len(_constituents(structure)))
+                    n += 1
+            return n
+
+        for rule in rules:
+            n = None
+            for fieldname in structures_fieldnames:
+                value = rule.get(fieldname)
+                if isinstance(value, list):
+                    n = (n or 0) + add_structures(value)
+            for fieldname in layers_fieldnames:
+                layers = rule.get(fieldname)
+                # (For other rule types, a list of feature strings.)
+                if not isinstance(layers, list) or not all(
+                    isinstance(layer, list) for layer in layers):
+                    continue
+                n = n or 0
+                num_layers = 0
+                for layer in layers:
+                    if not layer:
+                        continue
+                    num_layers += 1
+                    num_row, num_col = layer[1]
+                    rows.append(int(num_row))
+                    cols.append(int(num_col))
+                    # Title and row descriptors: [name, info], the info of
+                    # Phrase Builder being [InputStructures[,
+                    # OutputStructures]].
+                    for descriptor in [layer[0]] + layer[2:-1]:
+                        info = descriptor[1]
+                        if isinstance(info, list):
+                            for structures in info:
+                                if isinstance(structures, list):
+                                    n += add_structures(structures)
+                layers_per_rule.append(num_layers)
+            if n is not None:
+                structures_per_rule.append(n)
+
+        self.structures_per_rule.add_all(structures_per_rule)
+        self.constituents_per_structure.add_all(constituents)
+        self.layers_per_rule.add_all(layers_per_rule)
+        self.rows_per_layer.add_all(rows)
+        self.cols_per_layer.add_all(cols)
+
+#------------------------------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        """The statistics as a dict (see results)."""
+
+        return {
+            'db_name': self.db_name,
+            'table_name': self.table_name,
+            'imports': self.imports,
+            'rules': self.rules,
+            'size': self.size,
+            'fields': {fieldname: dist.to_dict()
+                       for fieldname, dist in self.fields.items()},
+            'structures_per_rule': self.structures_per_rule.to_dict(),
+            'constituents_per_structure':
+                self.constituents_per_structure.to_dict(),
+            'layers_per_rule': self.layers_per_rule.to_dict(),
+            'rows_per_layer': self.rows_per_layer.to_dict(),
+            'cols_per_layer': self.cols_per_layer.to_dict(),
+        }
+
+#==============================================================================
+# Recording.
+
+# Class name -> table name (first one listed for the class).
+_TABLE_NAMES = {}
+for _name, (_, _class_name) in _registry.TABLE_CLASSES.items():
+    _TABLE_NAMES.setdefault(_class_name, _name)
+del _name, _class_name
+
+def record_field_sizes(header: tuple, sizes: list):
+    """Keep the field sizes of the table being imported, collected while
+    parsing its rows (called by the importers generated by _schema)."""
+
+    _field_sizes.set((header, sizes))
+
+#------------------------------------------------------------------------------
+
+def record(table_object, table: list):
+    """Add the statistics of a table object just imported from table
+    (called by the import_table instrumentation, see _profiling)."""
+
+    class_name = type(table_object).__name__
+    key = (_database.get(), _TABLE_NAMES.get(class_name, class_name))
+
+    stats = _records.get(key)
+    if stats is None:
+        stats = _records[key] = TableStats(*key)
+
+    stats.imports += 1
+
+    # Field sizes collected by the importer, if they are for this table.
+    collected = _field_sizes.get()
+    if collected is not None:
+        _field_sizes.set(None)
+        header, sizes = collected
+        if not (table and header == tuple(table[0]) and all(
+            len(field_sizes) == len(table) - 1 for field_sizes in sizes)):
+            collected = None
+    if collected is not None:
+        stats.add_field_sizes(header, sizes)
+    else:
+        stats.add_rows(table)
+    stats.add_rules(table_object._rules, table[0] if table else [])
+
+#==============================================================================
+# Results.
+
+def results() -> list:
+    """Recorded statistics (see TableStats.to_dict), by decreasing size."""
+
+    out = [stats.to_dict() for stats in _records.values()]
+    out.sort(key=lambda entry: (-entry['size'], entry['db_name'],
+                                entry['table_name']))
+
+    return out
+
+#------------------------------------------------------------------------------
+
+def report(limit: int = None) -> str:
+    """Text report of the results, by decreasing size: per table the rules,
+    size, mean structures per rule and constituents per structure, mean
+    layers per rule and rows and columns per layer, and the largest field
+    (by total size) with its mean and max size."""
+
+    entries = results()[:limit]
+
+    width = max([len(e['db_name']) + 1 + len(e['table_name'])
+                 for e in entries] + [14])
+
+    def mean(dist):
+        return f'{dist["mean"]:.1f}' if dist['count'] else '-'
+
+    lines = [f'{"database/table":<{width}} {"rules":>7} {"KiB":>9} '
+             f'{"struct":>6} {"const":>6} {"layers":>6} {"rows":>6} '
+             f'{"cols":>6}  largest field (mean/max chars)']
+    for e in entries:
+        fields = sorted(e['fields'].items(), key=lambda kv: -kv[1]['total'])
+        largest = (f'{fields[0][0]} ({fields[0][1]["mean"]:.0f}/'
+                   f'{fields[0][1]["max"]})') if (
+                       fields and fields[0][1]['count']) else '-'
+        lines.append(
+            f'{e["db_name"] + "/" + e["table_name"]:<{width}} '
+            f'{e["rules"]:>7} {e["size"]/1024:>9.1f} '
+            f'{mean(e["structures_per_rule"]):>6} '
+            f'{mean(e["constituents_per_structure"]):>6} '
+            f'{mean(e["layers_per_rule"]):>6} '
+            f'{mean(e["rows_per_layer"]):>6} '
+            f'{mean(e["cols_per_layer"]):>6}  {largest}')
+
+    return '\n'.join(lines)
+
+#------------------------------------------------------------------------------
+
+def to_json(**kwargs) -> str:
+    """The results as JSON (a list of entries, see results())."""
+
+    return json.dumps(results(), **kwargs)
+
+#------------------------------------------------------------------------------
+
+def _report_at_exit(target: str):
+    """Output the results of a run with PARSING_STATS."""
+
+    if target == '1':
+        print(report(), file=sys.stderr)
+    else:
+        with open(target, 'w') as fp:
+            fp.write(to_json(indent=1))
+
+_target = os.environ.get('PARSING_STATS', '')
+if _target not in ('', '0'):
+    _set_enabled(True)
+    atexit.register(_report_at_exit, _target)
+
+#==============================================================================
@@ -7,9 +7,6 @@ Various utilities used throughout the code.
 
 import sys
 
-# To install yaml do this: pip install PyYAML
-import yaml
-
 # Check Python version
 if sys.version_info < (3, 7):
     sys.exit("This script requires Python 3.7 or higher"
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Round-trip verification of a table: original rows vs. rows exported after
+import.
+
+Both tables are streamed once and their rows compared directly; only the
+rows which differ are compared field by field, and all the mismatches are
+reported, not only the first.  (A faulty export, e.g. a field which is
+not a string, is thus reported as a mismatch.)
+
+Usage:
+    result = _verify.verify_round_trip(table, table_object.export_table())
+    if not result.is_ok:
+        print(result.report())
+
+============================================================================"""
+
+#==============================================================================
+
+class VerifyResult:
+    """
+    Result of verify_round_trip: the number of records and the list of
+    mismatches.
+
+    Each mismatch is a dict with the record number ('record', 0 being the
+    header) and either 'fieldname', 'expected' and 'found' for a field, or
+    'error' for a whole record (missing, extra, wrong number of fields).
+    """
+
+    def __init__(self, num_records: int, mismatches: list):
+        """Constructor for class."""
+
+        self.num_records = num_records
+        self.mismatches = mismatches
+
+    @property
+    def is_ok(self) -> bool:
+        """Whether the tables are identical."""
+
+        return not self.mismatches
+
+#------------------------------------------------------------------------------
+
+    def report(self, limit: int = None) -> str:
+        """Text report of the mismatches (at most limit of them)."""
+
+        lines = [f'{len(self.mismatches)} mismatch(es) in '
+                 f'{self.num_records} records']
+
+        for m in self.mismatches[:limit]:
+            if 'error' in m:
+                lines.append(f'  record {m["record"]}: {m["error"]}')
+            else:
+                lines.append(f'  record {m["record"]} fieldname '
+                             f'{m["fieldname"]} expected {m["expected"]!r} '
+                             f'found {m["found"]!r}')
+
+        if limit is not None and len(self.mismatches) > limit:
+            lines.append(f'  ... ({len(self.mismatches) - limit} more)')
+
+        return '\n'.join(lines)
+
+#==============================================================================
+
+def _diff_record(i: int, header: list, expected: list, found) -> list:
+    """Field mismatches of one record which differs."""
+
+    if not isinstance(found, list):
+        return [{'record': i, 'error': f'not a list of fields: {found!r}'}]
+
+    if len(found) != len(expected):
+        return [{'record': i, 'error': f'wrong number of fields expected '
+                 f'{len(expected)} found {len(found)}'}]
+
+    return [{'record': i, 'fieldname': header[j] if j < len(header) else j,
+             'expected': field, 'found': found[j]}
+            for j, field in enumerate(expected) if found[j] != field]
+
+#------------------------------------------------------------------------------
+
+def verify_round_trip(table: list, table_out: list) -> VerifyResult:
+    """Compare the original rows of a table with the exported ones."""
+
+    header = table[0] if table else []
+    mismatches = []
+
+    for i in range(max(len(table), len(table_out))):
+
+        if i >= len(table_out):
+            mismatches.append({'record': i, 'error': 'missing'})
+            continue
+
+        if i >= len(table):
+            mismatches.append({'record': i, 'error': 'extra'})
+            continue
+
+        if table[i] != table_out[i]:
+            mismatches += _diff_record(i, header, table[i], table_out[i])
+
+    return VerifyResult(len(table), mismatches)
+
+#==============================================================================
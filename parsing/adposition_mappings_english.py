@@ -8,6 +8,9 @@ Handle Adposition_Mappings_English table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 
 #==============================================================================
 
@@ -42,6 +45,15 @@ class AdpositionMappingsEnglish:
         'Expansion Rule Status',
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # Mappings.
+        'Mappings': _schema.PLAIN,
+        # Collocation Correction Rule.
+        'Collocation Correction Rule': _schema.PLAIN,
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -53,6 +65,7 @@ class AdpositionMappingsEnglish:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -88,73 +101,28 @@ class AdpositionMappingsEnglish:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self._fieldnames:
-                if fieldname not in self._fieldnames_impt:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # Mappings.
-            field = rule['Mappings'] = table[i+1][sfoo.index('Mappings')]
-
-            # Collocation Correction Rule.
-            field = rule['Collocation Correction Rule'] = (
-                table[i+1][sfoo.index('Collocation Correction Rule')])
+        self._fieldnames_order_orig = table_header.copy()
 
-            # Thing-Thing Relationships.
-            if 'Thing-Thing Relationships' in self._fieldnames_impt:
-                field = rule['Thing-Thing Relationships'] = (
-                    table[i+1][sfoo.index('Thing-Thing Relationships')])
-
-            # Convert To Verb.
-            if 'Convert To Verb' in self._fieldnames_impt:
-                field = rule['Convert To Verb'] = table[i+1][sfoo.index(
-                             'Convert To Verb')]
-
-            self._rules.append(rule)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self._fieldnames, self._fieldnames_impt, table_header)(table[1:])
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self._fieldnames.index(self._fieldnames_order_orig[j])
-                fieldname = self._fieldnames[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[i-1][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                # N/A
-
-                # Add field value to output.
-                result[-1].append(field)
-
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(
+            self._rules)
 
 #==============================================================================
@@ -8,6 +8,9 @@ Handle CharacterFeatureValues table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 
 #==============================================================================
 
@@ -40,6 +43,19 @@ class CharacterFeatureValues:
         'Comments',
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # Characters.
+        'Characters': _schema.PLAIN,
+        # Phonetic values.
+        'Values': _schema.PLAIN,
+        # Is this valid for use.
+        'Valid': _schema.one_of('0', '1'),
+        # Capitalization of each letter. Is '' if already capital.
+        'Capitals': _schema.PLAIN,
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -49,6 +65,7 @@ class CharacterFeatureValues:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -70,69 +87,28 @@ class CharacterFeatureValues:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self.FIELDNAMES:
-                if fieldname not in self.FIELDNAMES_IMPT:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # Characters.
-            field = rule['Characters'] = table[i+1][sfoo.index('Characters')]
-
-            # Phonetic values.
-            field = rule['Values'] = table[i+1][sfoo.index('Values')]
+        self._fieldnames_order_orig = table_header.copy()
 
-            # Is this valid for use.
-            field = rule['Valid'] = table[i+1][sfoo.index('Valid')]
-            assert field in ['0', '1']
-
-            # Capitalization of each letter. Is '' if already capital.
-            field = rule['Capitals'] = table[i+1][sfoo.index('Capitals')]
-
-            self._rules.append(rule)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self.FIELDNAMES, self.FIELDNAMES_IMPT, table_header)(table[1:])
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self.FIELDNAMES.index(self._fieldnames_order_orig[j])
-                fieldname = self.FIELDNAMES[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[i-1][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                # N/A
-
-                # Add field value to output.
-                result[-1].append(field)
-
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(
+            self._rules)
 
 #==============================================================================
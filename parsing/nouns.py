@@ -8,6 +8,9 @@ Handle Nouns table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 
 #==============================================================================
 
@@ -62,6 +65,20 @@ class Nouns:
         'FormReferences',
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).  (The Form fields, present in
+    # some tables only, are unimportant fields; see import_table.)
+
+    SCHEMA = _schema.TableSchema({
+        # Roots.
+        'Roots': _schema.PLAIN,
+        # Features.
+        'Features': _schema.PLAIN,
+        # Constituents
+        'Constituents': _schema.PLAIN,
+        # EntryID.
+        'EntryID': _schema.PLAIN,
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -72,6 +89,7 @@ class Nouns:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -105,69 +123,27 @@ class Nouns:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self._fieldnames:
-                if fieldname not in self.FIELDNAMES_IMPT:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # Roots.
-            field = rule['Roots'] = table[i+1][sfoo.index('Roots')]
-
-            # Features.
-            field = rule['Features'] = table[i+1][sfoo.index('Features')]
+        self._fieldnames_order_orig = table_header.copy()
 
-            # Constituents
-            field = rule['Constituents'] = table[i+1][sfoo.index(
-                         'Constituents')]
-
-            # EntryID.
-            field = rule['EntryID'] = table[i+1][sfoo.index('EntryID')]
-
-            self._rules.append(rule)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self._fieldnames, self.FIELDNAMES_IMPT, table_header)(table[1:])
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self._fieldnames.index(self._fieldnames_order_orig[j])
-                fieldname = self._fieldnames[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[i-1][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                # N/A
-
-                # Add field value to output.
-                result[-1].append(field)
-
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(self._rules)
 
 #==============================================================================
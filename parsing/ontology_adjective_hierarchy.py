@@ -6,6 +6,9 @@ Handle AdjectiveHierarchy table from Ontology.mdb file.
 ============================================================================"""
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 
 #==============================================================================
 
@@ -29,6 +32,17 @@ class OntologyAdjectiveHierarchy:
     FIELDNAMES = [
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # ID
+        'ID': _schema.PLAIN,
+        # ParentID
+        'ParentID': _schema.PLAIN,
+        # Group name.
+        'GroupName': _schema.PLAIN,
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -42,6 +56,7 @@ class OntologyAdjectiveHierarchy:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -63,35 +78,12 @@ class OntologyAdjectiveHierarchy:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self._fieldnames:
-                if fieldname not in self._fieldnames_impt:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # ID
-            field = rule['ID'] = table[i+1][sfoo.index('ID')]
+        self._fieldnames_order_orig = table_header.copy()
 
-            # ParentID
-            field = rule['ParentID'] = table[i+1][sfoo.index('ParentID')]
-
-            # Group name.
-            field = rule['GroupName'] = table[i+1][sfoo.index('GroupName')]
-
-            self._rules.append(rule)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self._fieldnames, self._fieldnames_impt, table_header)(table[1:])
 
         # Finally, sort to be in proper order (ascending order in key "ID").
         # First compute permutation vector and its inverse.
@@ -105,34 +97,21 @@ class OntologyAdjectiveHierarchy:
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self._fieldnames.index(self._fieldnames_order_orig[j])
-                fieldname = self._fieldnames[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[
-                                                self._iperm[i-1]][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                # N/A
-
-                # Add field value to output.
-                result[-1].append(field)
+        # Rules in the order of the records.
+        rules = [self._rules[k] for k in self._iperm]
 
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(rules)
 
 #==============================================================================
@@ -6,6 +6,9 @@ Handle Adpositions table from Ontology.mdb file.
 ============================================================================"""
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 
 #==============================================================================
 
@@ -46,6 +49,21 @@ class OntologyAdpositions:
         'Linguists Assistant',
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # Roots.
+        'Roots': _schema.PLAIN,
+        # Categories.
+        'Categories': _schema.PLAIN,
+        # Level (sematic atom, etc.).
+        'Level': _schema.PLAIN,
+        # ParentID
+        'ParentID': _schema.PLAIN,
+        # Generic Thing-Thing Relationships (Ontology_Nouns only).
+        'Generic Thing-Thing Relationships': _schema.PLAIN,
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -59,6 +77,7 @@ class OntologyAdpositions:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -80,43 +99,12 @@ class OntologyAdpositions:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self._fieldnames:
-                if fieldname not in self._fieldnames_impt:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # Roots.
-            field = rule['Roots'] = table[i+1][sfoo.index('Roots')]
-
-            # Categories.
-            field = rule['Categories'] = table[i+1][sfoo.index('Categories')]
+        self._fieldnames_order_orig = table_header.copy()
 
-            # Level (sematic atom, etc.).
-            field = rule['Level'] = table[i+1][sfoo.index('Level')]
-
-            # ParentID
-            field = rule['ParentID'] = table[i+1][sfoo.index('ParentID')]
-
-            # Generic Thing-Thing Relationships.
-            if 'Generic Thing-Thing Relationships' in self._fieldnames_impt:
-                field = rule['Generic Thing-Thing Relationships'] = (
-                    table[i+1][sfoo.index('Generic Thing-Thing Relationships')])
-
-            self._rules.append(rule)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self._fieldnames, self._fieldnames_impt, table_header)(table[1:])
 
         # Finally, sort to be in proper order (ascending order in key "ID").
         # First compute permutation vector and its inverse.
@@ -130,35 +118,22 @@ class OntologyAdpositions:
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self._fieldnames.index(self._fieldnames_order_orig[j])
-                fieldname = self._fieldnames[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[
-                                                self._iperm[i-1]][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                # N/A
-
-                # Add field value to output.
-                result[-1].append(field)
+        # Rules in the order of the records.
+        rules = [self._rules[k] for k in self._iperm]
 
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(rules)
 
 #==============================================================================
 
@@ -8,6 +8,9 @@ Handle Features_Source table from Ontology.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 
 #==============================================================================
 
@@ -38,6 +41,17 @@ class OntologyFeaturesSource:
         'ID', # it would seem this not needed for translation
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # Syntactic category.
+        'SyntacticCategory': _schema.SYNCAT,
+        # Feature name.
+        'FeatureName': _schema.PLAIN,
+        # Feature values.
+        'FeatureValues': _schema.split2('|', '/'),
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -47,6 +61,7 @@ class OntologyFeaturesSource:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -68,74 +83,28 @@ class OntologyFeaturesSource:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self.FIELDNAMES:
-                if fieldname not in self.FIELDNAMES_IMPT:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # What is the syncat of the word that gets the clitic.
-            field = rule['SyntacticCategory'] = (
-                table[i+1][sfoo.index('SyntacticCategory')])
-            # ISSUE: the following could possibly be made more restrictive.
-            # ISSUE: does this need to account for user-defined syncats.
-            assert field in _utils.SYNTACTIC_CATEGORIES.values()
+        self._fieldnames_order_orig = table_header.copy()
 
-            # Feature name.
-            field = rule['FeatureName'] = table[i+1][sfoo.index('FeatureName')]
-
-            # Feature values.
-            field = rule['FeatureValues'] = table[i+1][sfoo.index(
-                         'FeatureValues')]
-            rule['FeatureValues'] = [f.split('/') if f != '' else []
-                for f in field.split('|')]
-
-            self._rules.append(rule)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self.FIELDNAMES, self.FIELDNAMES_IMPT, table_header)(table[1:])
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self.FIELDNAMES.index(self._fieldnames_order_orig[j])
-                fieldname = self.FIELDNAMES[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[i-1][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                if i != 0 and fieldname == 'FeatureValues':
-                    field = '|'.join(['/'.join(f) if f != [] else ''
-                        for f in field])
-
-                # Add field value to output.
-                result[-1].append(field)
-
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(
+            self._rules)
 
 #==============================================================================
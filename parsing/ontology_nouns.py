@@ -25,8 +25,8 @@ class OntologyNouns(OntologyAdpositions):
         'Roots',
         'Categories',
         'Level',
-        'Generic Thing-Thing Relationships',
         'ParentID',
+        'Generic Thing-Thing Relationships',
     ]
     
     # Define all fields associated wtih this table.
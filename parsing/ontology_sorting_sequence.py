@@ -8,6 +8,9 @@ Handle Sorting_Sequence table from Ontology.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 
 #==============================================================================
 
@@ -27,10 +30,10 @@ class OntologySortingSequence:
     # List of fields that are needed for the translation/generation.
 
     FIELDNAMES_IMPT = [
-        'Sequence',
         'IgnoredCharacters',
         'UnspecifiedCharacters',
         'UnicodeFontType',
+        'Sequence',
     ]
 
     # Define all fields associated wtih this table.
@@ -39,6 +42,20 @@ class OntologySortingSequence:
         'ID', # it would seem this not needed for translation
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # Sequence (each subfield is lower case then capital, if any).
+        # ISSUE: why does English have I"
+        'Sequence': _schema.split2('|', '/'),
+        # Ignored characters for sorting purposes.
+        'IgnoredCharacters': _schema.PLAIN,
+        # Unspecified characters.
+        'UnspecifiedCharacters': _schema.PLAIN,
+        # Unicode font type.
+        'UnicodeFontType': _schema.PLAIN,
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -48,6 +65,7 @@ class OntologySortingSequence:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -69,78 +87,28 @@ class OntologySortingSequence:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self.FIELDNAMES:
-                if fieldname not in self.FIELDNAMES_IMPT:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # Ignored characters for sorting purposes.
-            field = rule['IgnoredCharacters'] = table[i+1][sfoo.index(
-                         'IgnoredCharacters')]
-
-            # Unspecified characters.
-            field = rule['UnspecifiedCharacters'] = table[i+1][sfoo.index(
-                         'UnspecifiedCharacters')]
+        self._fieldnames_order_orig = table_header.copy()
 
-            # Unicode font type.
-            field = rule['UnicodeFontType'] = table[i+1][sfoo.index(
-                         'UnicodeFontType')]
-
-            # Sequence (each subfield is lower case then capital, if any).
-            # ISSUE: why does English have I"
-            field = rule['Sequence'] = table[i+1][sfoo.index('Sequence')]
-            rule['Sequence'] = [f.split('/') if f != '' else []
-                for f in field.split('|')]
-
-            self._rules.append(rule)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self.FIELDNAMES, self.FIELDNAMES_IMPT, table_header)(table[1:])
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self.FIELDNAMES.index(self._fieldnames_order_orig[j])
-                fieldname = self.FIELDNAMES[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[i-1][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                if i != 0 and fieldname == 'Sequence':
-
-                    field = '|'.join(['/'.join(f) if f != [] else ''
-                        for f in field])
-
-
-                # Add field value to output.
-                result[-1].append(field)
-
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(
+            self._rules)
 
 #==============================================================================
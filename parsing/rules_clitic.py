@@ -8,8 +8,21 @@ Handle Rules_Clitic table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 from _input_structures import *
 
+#------------------------------------------------------------------------------
+
+def _decode_clitic(field: str) -> str:
+    """Check the Clitic field (the tabular form is not implemented)."""
+
+    assert '<|>' not in field, (
+        "Error: tabular form of clitic rule not implemented.")
+    # TODO: implement tabular case, cf. CliticRuleDlg.cpp.
+    return field
+
 #==============================================================================
 
 class RulesClitic:
@@ -86,6 +99,34 @@ class RulesClitic:
         'GrammarTopics',
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # Is the rule set to "active" (to be used when translating).
+        'Status': _schema.one_of('0', '1'),
+        # What is the syncat of the word that gets the clitic.
+        # ISSUE: the following could possibly be made more restrictive.
+        # ISSUE: does this need to account for user-defined syncats.
+        'SyntacticCategory': _schema.SYNCAT,
+        # Where is the clitic placed with respect to the word.
+        'CliticType': _schema.one_of(*_utils.CLITIC_TYPES),
+        # Specify features for match. Delimiter is "^"; 3 fields:
+        # word features, phrase features, clause features.
+        'Features': _schema.split('^'),
+        # Parse the input structure.
+        'InputStructure': _schema.Codec(
+            decode='{parse}({x}, rule_type={rule_type})',
+            encode='{unparse}({x}, rule_type={rule_type})',
+            env={'parse': import_input_structure,
+                 'unparse': export_input_structure,
+                 'rule_type': RULE_TYPE},
+            interned=True),
+        # Get the clitic letters/punctuation (single, or tabular)
+        'Clitic': _schema.Codec(decode=_decode_clitic),
+        # Does the clitic attach to the word.
+        'CliticAttaches': _schema.one_of('0', '1'),
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -95,6 +136,7 @@ class RulesClitic:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -116,97 +158,28 @@ class RulesClitic:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self.FIELDNAMES:
-                if fieldname not in self.FIELDNAMES_IMPT:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # Is the rule set to "active" (to be used when translating).
-            field = rule['Status'] = table[i+1][sfoo.index('Status')]
-            assert field in ['0', '1']
-
-            # What is the syncat of the word that gets the clitic.
-            field = rule['SyntacticCategory'] = (
-                table[i+1][sfoo.index('SyntacticCategory')])
-            # ISSUE: the following could possibly be made more restrictive.
-            # ISSUE: does this need to account for user-defined syncats.
-            assert field in _utils.SYNTACTIC_CATEGORIES.values()
+        self._fieldnames_order_orig = table_header.copy()
 
-            # Where is the clitic placed with respect to the word.
-            field = rule['CliticType'] = table[i+1][sfoo.index('CliticType')]
-            assert field in _utils.CLITIC_TYPES
-
-            # Specify features for match. Delimiter is "^"; 3 fields:
-            # word features, phrase features, clause features.
-            field = rule['Features'] = (
-                table[i+1][sfoo.index('Features')].split('^'))
-
-            # Parse the input structure.
-            field = rule['InputStructure'] = import_input_structure(
-                table[i+1][sfoo.index('InputStructure')],
-                rule_type=self.RULE_TYPE)
-
-            # Get the clitic letters/punctuation (single, or tabular)
-            field = rule['Clitic'] = table[i+1][sfoo.index('Clitic')]
-            assert '<|>' not in rule['Clitic'], (
-                "Error: tabular form of clitic rule not implemented.")
-            # TODO: implement tabular case, cf. CliticRuleDlg.cpp.
-
-            # Does the clitic attach to the word.
-            field = rule['CliticAttaches'] = (
-                table[i+1][sfoo.index('CliticAttaches')])
-            assert field in ['0', '1']
-
-            self._rules.append(rule)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self.FIELDNAMES, self.FIELDNAMES_IMPT, table_header)(table[1:])
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self.FIELDNAMES.index(self._fieldnames_order_orig[j])
-                fieldname = self.FIELDNAMES[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[i-1][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                if i != 0 and fieldname == 'InputStructure':
-                    field = export_input_structure(field, 
-                                                   rule_type=self.RULE_TYPE)
-
-                if i != 0 and fieldname == 'Features':
-                    field = '^'.join(field)
-
-                # Add field value to output.
-                result[-1].append(field)
-
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(
+            self._rules)
 
 #==============================================================================
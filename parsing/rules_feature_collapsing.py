@@ -8,6 +8,25 @@ Handle Rules_FeatureCollapsing table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
+import _schema
+
+#------------------------------------------------------------------------------
+
+def _decode_rules(field: str) -> list:
+    """Parse the Rules field: comma-terminated list of 2-character pairs."""
+
+    pairs = field.split(',')
+    assert pairs[-1] == ''
+    pairs = pairs[:-1]
+    assert all(len(p) == 2 for p in pairs)
+    return [[p[0], p[1]] for p in pairs]
+
+def _encode_rules(field: list) -> str:
+    """Inverse of _decode_rules."""
+
+    return ','.join([''.join([p[0], p[1]]) for p in field]) + ','
 
 #==============================================================================
 
@@ -43,6 +62,17 @@ class RulesFeatureCollapsing:
         'ID', # it would seem this not needed for translation
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # What is syncat of the word whose feature value would be changed.
+        'SyntacticCategory': _schema.SYNCAT,
+        # What is the name of the feature whose value is to be changed.
+        'FeatureName': _schema.PLAIN,
+        # Get source (original) and target (new) feature values.
+        'Rules': _schema.Codec(decode=_decode_rules, encode=_encode_rules),
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -52,6 +82,7 @@ class RulesFeatureCollapsing:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -73,77 +104,28 @@ class RulesFeatureCollapsing:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
+        self._fieldnames_order_orig = table_header.copy()
 
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self.FIELDNAMES:
-                if fieldname not in self.FIELDNAMES_IMPT:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # What is syncat of the word whose feature value would be changed.
-            field = rule['SyntacticCategory'] = (
-                table[i+1][sfoo.index('SyntacticCategory')])
-            # ISSUE: the following could possibly be made more restrictive.
-            # ISSUE: does this need to account for user-defined syncats.
-            assert field in _utils.SYNTACTIC_CATEGORIES.values()
-
-            # What is the name of the feature whose value is to be changed.
-            field = rule['FeatureName'] = table[i+1][sfoo.index('FeatureName')]
-
-            # Get source (original) and target (new) feature values.
-            field = rule['Rules'] = table[i+1][sfoo.index('Rules')]
-            pairs = field.split(',')
-            assert pairs[-1] == ''
-            pairs = pairs[:-1]
-            assert all(len(p) == 2 for p in pairs)
-            field = [[p[0], p[1]] for p in pairs]
-            rule['Rules'] = field
-
-            self._rules.append(rule)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self.FIELDNAMES, self.FIELDNAMES_IMPT, table_header)(table[1:])
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self.FIELDNAMES.index(self._fieldnames_order_orig[j])
-                fieldname = self.FIELDNAMES[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[i-1][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                if i != 0 and fieldname == 'Rules':
-                    field = ','.join([''.join([p[0], p[1]]) for p in field])
-                    field += ','
-
-                # Add field value to output.
-                result[-1].append(field)
-
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(
+            self._rules)
 
 #==============================================================================
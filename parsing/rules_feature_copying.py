@@ -8,6 +8,8 @@ Handle Rules_FeatureCopying table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
 from _input_structures import *
 from _output_structures import *
 
@@ -105,6 +107,7 @@ class RulesFeatureCopying:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -220,8 +223,12 @@ class RulesFeatureCopying:
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
@@ -8,6 +8,8 @@ Handle Rules_FindReplace table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
 from _input_structures import *
 
 #==============================================================================
@@ -61,6 +63,7 @@ CTA1Doc::GetIdiomRule
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -149,8 +152,12 @@ CTA1Doc::GetIdiomRule
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
@@ -8,6 +8,9 @@ Handle Rules_NounNounRelationships table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 
 #==============================================================================
 
@@ -45,6 +48,16 @@ class RulesNounNounRelationships:
         'Example',
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # Get the relationship concept.
+        'Relationship Concept': _schema.checked(
+            "len({x}) > 1 and {x}[0] == '-'"),
+        # Get the noun-noun relationship.
+        'Noun-Noun Relationship': _schema.checked('len({x}) <= 1'),
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -54,6 +67,7 @@ class RulesNounNounRelationships:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -75,71 +89,28 @@ class RulesNounNounRelationships:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self.FIELDNAMES:
-                if fieldname not in self.FIELDNAMES_IMPT:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # Get the relationship concept.
-            field = rule['Relationship Concept'] = (
-                table[i+1][sfoo.index('Relationship Concept')])
-            assert len(field) > 1 and field[0] == '-'
+        self._fieldnames_order_orig = table_header.copy()
 
-            # Get the noun-noun relationship.
-            field = rule['Noun-Noun Relationship'] = (
-                table[i+1][sfoo.index('Noun-Noun Relationship')])
-            assert len(field) <= 1
-
-            self._rules.append(rule)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self.FIELDNAMES, self.FIELDNAMES_IMPT, table_header)(table[1:])
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self.FIELDNAMES.index(self._fieldnames_order_orig[j])
-                fieldname = self.FIELDNAMES[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[i-1][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                if i != 0 and fieldname == 'InputStructure':
-                    field = export_input_structure(field, 
-                                                   rule_type=self.RULE_TYPE)
-
-                if i != 0 and fieldname == 'Features':
-                    field = '^'.join(field)
-
-                # Add field value to output.
-                result[-1].append(field)
-
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(
+            self._rules)
 
 #==============================================================================
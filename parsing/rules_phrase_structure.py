@@ -8,8 +8,64 @@ Handle Rules_PhraseStructure table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 from _input_structures import *
 
+#------------------------------------------------------------------------------
+
+def _decode_rule(field: str) -> list:
+    """Parse the Rule field: "^"-separated nodes of the phrase structure
+    tree."""
+
+    out = []
+    for subfield in field.split('^'):
+        out.append([])
+        # Empty line.
+        if subfield == '':
+            pass
+        # Non leaf node.
+        elif subfield[0] == '*':
+            # Non leaf node indicator
+            out[-1].append(subfield[0])
+            # level (0=top branches)
+            out[-1].append(subfield[1])
+            # node name (group name)
+            out[-1].append(subfield[2:])
+        # User defined syncat leaf node.
+        elif subfield[0] == '&':
+            # user defined syncat indicator
+            out[-1].append(subfield[0])
+            # syncat name, features (blank), example, (optional) name
+            out[-1] += subfield[1:].split('|')
+        # Non user defined leaf node.
+        else:
+            # syncat id, features, example, (optional) name
+            out[-1] += subfield.split('|')
+
+    return out
+
+def _encode_rule(field: list) -> str:
+    """Inverse of _decode_rule."""
+
+    out = []
+    for subfield in field:
+        out.append('')
+        if subfield == []:
+            pass
+        elif subfield[0] == '*':
+            out[-1] += subfield[0]
+            out[-1] += subfield[1]
+            out[-1] += '|'.join(subfield[2:])
+        elif subfield[0] == '&':
+            out[-1] += subfield[0]
+            out[-1] += '|'.join(subfield[1:])
+        else:
+            out[-1] += '|'.join(subfield)
+
+    return '^'.join(out)
+
 #==============================================================================
 
 class RulesPhraseStructure:
@@ -53,6 +109,30 @@ CUtilities::BuildPSRConstituentName
         'Cooccurrences',
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # Is the rule set to "active" (to be used when translating).
+        'Status': _schema.one_of('0', '1'),
+        # What is the syncat of the word that gets the clitic.
+        # ISSUE: the following could possibly be made more restrictive.
+        # ISSUE: does this need to account for user-defined syncats.
+        'SyntacticCategory': _schema.SYNCAT,
+        # Get Rule.
+        'Rule': _schema.Codec(decode=_decode_rule, encode=_encode_rule),
+        # Specify features for match. Delimiter is "^"; 3 fields:
+        # word features, phrase features, clause features.
+        'RulesFeatures': _schema.split('^'),
+        # Parse the input structure.
+        'InputStructure': _schema.Codec(
+            decode='{parse}({x}, rule_type={rule_type})',
+            encode='{unparse}({x}, rule_type={rule_type})',
+            env={'parse': import_input_structure,
+                 'unparse': export_input_structure,
+                 'rule_type': RULE_TYPE},
+            interned=True),
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -62,6 +142,7 @@ CUtilities::BuildPSRConstituentName
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -83,135 +164,28 @@ CUtilities::BuildPSRConstituentName
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self.FIELDNAMES:
-                if fieldname not in self.FIELDNAMES_IMPT:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # Is the rule set to "active" (to be used when translating).
-            field = rule['Status'] = table[i+1][sfoo.index('Status')]
-            assert field in ['0', '1']
-
-            # What is the syncat of the word that gets the clitic.
-            field = rule['SyntacticCategory'] = (
-                table[i+1][sfoo.index('SyntacticCategory')])
-            # ISSUE: the following could possibly be made more restrictive.
-            # ISSUE: does this need to account for user-defined syncats.
-            assert field in _utils.SYNTACTIC_CATEGORIES.values()
-
-            # Get Rule.
-            field = rule['Rule'] = table[i+1][sfoo.index(
-                         'Rule')]
-
-            field = field.split('^')
-
-            field2 = []
-            for subfield in field:
-                field2.append([])
-                # Empty line.
-                if subfield == '':
-                    pass
-                # Non leaf node.
-                elif subfield[0] == '*':
-                    # Non leaf node indicator
-                    field2[-1].append(subfield[0])
-                    # level (0=top branches)
-                    field2[-1].append(subfield[1])
-                    # node name (group name)
-                    field2[-1].append(subfield[2:])
-                # User defined syncat leaf node.
-                elif subfield[0] == '&':
-                    # user defined syncat indicator
-                    field2[-1].append(subfield[0])
-                    # syncat name, features (blank), example, (optional) name
-                    field2[-1] += subfield[1:].split('|')
-                # Non user defined leaf node.
-                else:
-                    # syncat id, features, example, (optional) name
-                    field2[-1] += subfield.split('|')
-
-            rule['Rule'] = field2
-
-            # Specify features for match. Delimiter is "^"; 3 fields:
-            # word features, phrase features, clause features.
-            field = rule['RulesFeatures'] = (
-                table[i+1][sfoo.index('RulesFeatures')].split('^'))
-
-            # Parse the input structure.
-            field = rule['InputStructure'] = import_input_structure(
-                table[i+1][sfoo.index('InputStructure')],
-                rule_type=self.RULE_TYPE)
-
-            self._rules.append(rule)
+        self._fieldnames_order_orig = table_header.copy()
+
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self.FIELDNAMES, self.FIELDNAMES_IMPT, table_header)(table[1:])
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self.FIELDNAMES.index(self._fieldnames_order_orig[j])
-                fieldname = self.FIELDNAMES[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[i-1][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                if i != 0 and fieldname == 'Rule':
-
-                    field2 = []
-
-                    for subfield in field:
-                        field2.append('')
-                        if subfield == []:
-                            pass
-                        elif subfield[0] == '*':
-                            field2[-1] += subfield[0]
-                            field2[-1] += subfield[1]
-                            field2[-1] += '|'.join(subfield[2:])
-                        elif subfield[0] == '&':
-                            field2[-1] += subfield[0]
-                            field2[-1] += '|'.join(subfield[1:])
-                        else:
-                            field2[-1] += '|'.join(subfield)
-
-                    field = '^'.join(field2)
-
-                if i != 0 and fieldname == 'RulesFeatures':
-                    field = '^'.join(field)
-
-                if i != 0 and fieldname == 'InputStructure':
-                    field = export_input_structure(field, 
-                                                   rule_type=self.RULE_TYPE)
-
-                # Add field value to output.
-                result[-1].append(field)
-
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(
+            self._rules)
 
 #==============================================================================
@@ -8,6 +8,9 @@ Handle Rules_RelativeClauses table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 
 #==============================================================================
 
@@ -66,6 +69,19 @@ class RulesRelativeClauses:
         'References',
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # Get the relativization strategy.
+        'Strategies': _schema.checked('len({x}) == 2'),
+        # Get the relativizer word.
+        'Relativizer': _schema.PLAIN,
+        # Get the features that must be matched by the noun phrase.
+        'Features': _schema.PLAIN,
+        # Get the structure for how the rel clause is built.
+        'Structure': _schema.checked("len({x}) >= 6 or {x} == ''"),
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -75,6 +91,7 @@ class RulesRelativeClauses:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -96,70 +113,28 @@ class RulesRelativeClauses:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self.FIELDNAMES:
-                if fieldname not in self.FIELDNAMES_IMPT:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # Get the relativization strategy.
-            field = rule['Strategies'] = table[i+1][sfoo.index('Strategies')]
-            assert len(field) == 2
-
-            # Get the relativizer word.
-            field = rule['Relativizer'] = table[i+1][sfoo.index('Relativizer')]
+        self._fieldnames_order_orig = table_header.copy()
 
-            # Get the features that must be matched by the noun phrase.
-            field = rule['Features'] = table[i+1][sfoo.index('Features')]
-
-            # Get the structure for how the rel clause is built.
-            field = rule['Structure'] = table[i+1][sfoo.index('Structure')]
-            assert len(field) >= 6 or field == ''
-
-            self._rules.append(rule)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self.FIELDNAMES, self.FIELDNAMES_IMPT, table_header)(table[1:])
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self.FIELDNAMES.index(self._fieldnames_order_orig[j])
-                fieldname = self.FIELDNAMES[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[i-1][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                # ...
-
-                # Add field value to output.
-                result[-1].append(field)
-
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(
+            self._rules)
 
 #==============================================================================
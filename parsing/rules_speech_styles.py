@@ -8,6 +8,9 @@ Handle Rules_SpeechStyles table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
+import _schema
 
 #==============================================================================
 
@@ -51,6 +54,17 @@ class RulesSpeechStyles:
         'References',
     ] + FIELDNAMES_IMPT
 
+    # Parsing of the fields (see _schema).
+
+    SCHEMA = _schema.TableSchema({
+        # Is the rule set to "active" (to be used when translating).
+        'Status': _schema.one_of('0', '1'),
+        # Input features string.
+        'InputFeatures': _schema.split('^'),
+        # Output features string.
+        'OutputFeatures': _schema.split(','),
+    })
+
 #------------------------------------------------------------------------------
 
     def __init__(self):
@@ -60,6 +74,7 @@ class RulesSpeechStyles:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -81,78 +96,35 @@ class RulesSpeechStyles:
         self._num_rules = len(table) - 1
 
         # Need this because order of fields is not guaranteed.
-        sfoo = self._fieldnames_order_orig = table_header.copy()
-
-        # Now parse rules (one per table record) one by one.
-
-        self._rules = []
-
-        for i in range(self._num_rules):
-
-            # Parse rule.
-
-            rule = {}
-
-            # Copy all "unimportant" rule fields
-            # (= those with no impact on translation/generation result).
-            for fieldname in self.FIELDNAMES:
-                if fieldname not in self.FIELDNAMES_IMPT:
-                    j = sfoo.index(fieldname)
-                    rule[fieldname] = table[i+1][j]
-
-            # Is the rule set to "active" (to be used when translating).
-            field = rule['Status'] = table[i+1][sfoo.index('Status')]
-            assert field in ['0', '1']
+        self._fieldnames_order_orig = table_header.copy()
 
-            # Input features string.
-            field = rule['InputFeatures'] = (
-                table[i+1][sfoo.index('InputFeatures')])
-            field = field.split('^')
-            rule['InputFeatures'] = field
-            assert len(field) == (4 if
-              self.RULE_TYPE == _utils.RULE_TYPES['Rules_SpeechStyles'] else 3)
+        # Parse the rules (one per table record), with the code generated
+        # from SCHEMA for this order of fields.
+        self._rules = self.SCHEMA.importer(
+            self.FIELDNAMES, self.FIELDNAMES_IMPT, table_header)(table[1:])
 
-            # Output features string.
-            field = rule['OutputFeatures'] = (
-                table[i+1][sfoo.index('OutputFeatures')])
-            field = field.split(',')
-            rule['OutputFeatures'] = field
-
-            self._rules.append(rule)
+        # InputFeatures has a fourth field (source text) only for speech
+        # styles (cf. RulesTenseAspectMood).
+        num_input_features = 4 if (
+            self.RULE_TYPE == _utils.RULE_TYPES['Rules_SpeechStyles']) else 3
+        assert all(len(rule['InputFeatures']) == num_input_features
+                   for rule in self._rules)
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
         assert self._is_set, (
            'Error: cannot export because table has not been set.')
 
-        result = []
-
-        # Loop over table lines.
-        for i in range(1+self._num_rules):
-            result.append([])
-            for j in range(len(self._fieldnames_order_orig)):
-                k = self.FIELDNAMES.index(self._fieldnames_order_orig[j])
-                fieldname = self.FIELDNAMES[k]
-
-                # Pick up field from either the header or the rule.
-                field = fieldname if i==0 else self._rules[i-1][fieldname]
-
-                # Correct entries that have had special parsing.
-
-                if i != 0 and fieldname == 'InputFeatures':
-                    field = '^'.join(field)
-
-                if i != 0 and fieldname == 'OutputFeatures':
-                    field = ','.join(field)
-
-                # Add field value to output.
-                result[-1].append(field)
-
-        return result
+        return self.SCHEMA.exporter(self._fieldnames_order_orig)(
+            self._rules)
 
 #==============================================================================
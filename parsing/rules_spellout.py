@@ -8,6 +8,8 @@ Handle Rules_Spellout table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
 from _input_structures import *
 from _output_structures import *
 from _spellout_tables import *
@@ -399,6 +401,7 @@ Parsing: contains new morpheme text
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: str):
         """
         Import and parse the table.
@@ -779,8 +782,12 @@ Parsing: contains new morpheme text
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
@@ -8,6 +8,8 @@ Handle Rules_Transfer table from <MyLanguage>.mdb file.
 import re
 
 import _utils
+import _profiling
+import _incremental
 from _input_structures import *
 from _output_structures import *
 
@@ -69,6 +71,7 @@ class RulesTransfer:
 
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def import_table(self, table: list):
         """
         Import and parse the table.
@@ -190,8 +193,12 @@ class RulesTransfer:
 
         self._is_set = True
 
+        # The rules changed (see _incremental.generation).
+        _incremental.touch(self)
+
 #------------------------------------------------------------------------------
 
+    @_profiling.profiled_method
     def export_table(self) -> str:
         """Convert the parsed table back into string form."""
 
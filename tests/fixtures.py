@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Test data: a few records of some tables of an English database and of
+the Ontology, as CSV files written like mdb-export does
+(data/<db_name>/<table name in the .mdb file>.csv), and the stand-in for
+mdb-export which prints them (stub-mdb-export).
+
+============================================================================"""
+
+import os
+import sys
+import csv
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.append(os.path.join(TESTS_DIR, '..', 'parsing'))
+
+import _registry
+
+# Avoid csv size failure (as in tester).
+csv.field_size_limit(sys.maxsize)
+
+DATA_DIR = os.path.join(TESTS_DIR, 'data')
+STUB_MDB_EXPORT = os.path.join(TESTS_DIR, 'stub-mdb-export')
+
+DB_NAMES = ['English', 'Ontology']
+
+#==============================================================================
+
+def read_csv(file_path: str) -> list:
+    """The rows of a CSV file (header first)."""
+
+    with open(file_path, newline='') as csvfile:
+        return [row for row in csv.reader(csvfile)]
+
+#------------------------------------------------------------------------------
+
+def table_files() -> list:
+    """(db_name, table_name, file path) of the tables of the test data."""
+
+    out = []
+    for db_name in DB_NAMES:
+        for file_name in sorted(os.listdir(os.path.join(DATA_DIR, db_name))):
+            name = os.path.splitext(file_name)[0]
+            if db_name == 'Ontology':
+                name = _registry.ONTOLOGY_PREFIX + name
+            out.append((db_name, name,
+                        os.path.join(DATA_DIR, db_name, file_name)))
+    return out
+
+#------------------------------------------------------------------------------
+
+def table_names() -> list:
+    """Names of the tables of the test data."""
+
+    return sorted({table_name for _, table_name, _ in table_files()})
+
+#------------------------------------------------------------------------------
+
+def load_tables() -> tuple:
+    """The tables of the test data, parsed: ({db_name: {table_name: table
+    object}}, {(db_name, table_name): rows})."""
+
+    tables = {}
+    rows = {}
+    for db_name, table_name, file_path in table_files():
+        table = read_csv(file_path)
+        table_object = _registry.create_table_object(table_name)
+        table_object.import_table(table)
+        tables.setdefault(db_name, {})[table_name] = table_object
+        rows[db_name, table_name] = table
+
+    return tables, rows
+
+#==============================================================================
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Tests of _csv_stream: records and rows are the same however the input is
+split into chunks (inside quoted fields, between the quotes of an escaped
+quote, between CR and LF, inside a multi-byte character).
+
+============================================================================"""
+
+import io
+import csv
+import unittest
+
+import fixtures
+
+import _csv_stream
+
+# Records as written by mdb-export: quoted fields with line breaks (CR LF
+# and LF), escaped quotes, empty quoted fields; the last one has no final
+# line feed.
+RECORDS = [
+    'ID,InputStructures,Comment\n',
+    '1,"(~|c-\r\n&Bdog~|N-c~|12\r\n)~|\r\n",plain\n',
+    '2,"say ""hi""","multi\nline ""q"""\n',
+    '3,"",""""\n',
+    '4,"é, 中文 and ""€""",\n',
+    '5,"\n\n",end',
+]
+TEXT = ''.join(RECORDS)
+
+def _rows(text: str) -> list:
+    """Rows of a CSV text, read at once."""
+
+    return list(csv.reader(io.StringIO(text, newline='')))
+
+#==============================================================================
+
+class RecordSplitterTest(unittest.TestCase):
+    """
+    RecordSplitter gives the complete records of the text.
+    """
+
+    def _split(self, chunks: list) -> list:
+        splitter = _csv_stream.RecordSplitter()
+        records = []
+        for chunk in chunks:
+            records += splitter.feed(chunk)
+        return records + splitter.close()
+
+    def test_whole(self):
+
+        self.assertEqual(self._split([TEXT]), RECORDS)
+
+    def test_two_chunks(self):
+
+        for i in range(len(TEXT) + 1):
+            with self.subTest(split=i):
+                self.assertEqual(self._split([TEXT[:i], TEXT[i:]]), RECORDS)
+
+    def test_one_character_chunks(self):
+
+        self.assertEqual(self._split(list(TEXT)), RECORDS)
+
+    def test_final_line_feed(self):
+
+        self.assertEqual(self._split([TEXT + '\n']),
+                         RECORDS[:-1] + [RECORDS[-1] + '\n'])
+        self.assertEqual(self._split(['']), [])
+
+#==============================================================================
+
+class CsvStreamDecoderTest(unittest.TestCase):
+    """
+    CsvStreamDecoder gives the rows of the bytes.
+    """
+
+    def _decode(self, chunks: list) -> list:
+        decoder = _csv_stream.CsvStreamDecoder()
+        rows = []
+        for chunk in chunks:
+            rows += decoder.feed(chunk)
+        return rows + decoder.close()
+
+    def test_two_chunks(self):
+
+        data = TEXT.encode('utf-8')
+        expected = _rows(TEXT)
+        for i in range(len(data) + 1):
+            with self.subTest(split=i):
+                self.assertEqual(self._decode([data[:i], data[i:]]),
+                                 expected)
+
+    def test_one_byte_chunks(self):
+
+        data = TEXT.encode('utf-8')
+        self.assertEqual(
+            self._decode([data[i:i+1] for i in range(len(data))]),
+            _rows(TEXT))
+
+    def test_iter_rows(self):
+
+        for _, _, file_path in fixtures.table_files():
+            with open(file_path, 'rb') as fp:
+                rows = list(_csv_stream.iter_rows(fp, chunk_size=7))
+            self.assertEqual(rows, fixtures.read_csv(file_path))
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
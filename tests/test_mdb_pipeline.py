@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Tests of _mdb_pipeline, with the stand-in for mdb-export (see fixtures).
+
+============================================================================"""
+
+import unittest
+
+import fixtures
+
+import _mdb_pipeline
+import _table_stats
+
+#==============================================================================
+
+class LoadDatabasesTest(unittest.TestCase):
+    """
+    Tables exported and parsed by the pipeline are those parsed from the
+    CSV files.
+    """
+
+    def test_load_databases(self):
+
+        tables = _mdb_pipeline.load_databases(
+            fixtures.DATA_DIR, fixtures.DB_NAMES, fixtures.table_names(),
+            max_concurrency=2, mdb_export=fixtures.STUB_MDB_EXPORT)
+
+        expected_tables, rows = fixtures.load_tables()
+        for db_name, table_objects in expected_tables.items():
+            for table_name, expected in table_objects.items():
+                table_object = tables[db_name][table_name]
+                self.assertEqual(table_object._rules, expected._rules)
+                self.assertEqual(table_object.export_table(),
+                                 rows[db_name, table_name])
+
+    def test_read_mdb_table(self):
+
+        for db_name, table_name, file_path in fixtures.table_files():
+            rows = _mdb_pipeline.read_mdb_table(
+                f'{fixtures.DATA_DIR}/{db_name}.mdb', table_name,
+                mdb_export=fixtures.STUB_MDB_EXPORT)
+            self.assertEqual(rows, fixtures.read_csv(file_path))
+
+    def test_export_failure(self):
+
+        with self.assertRaisesRegex(RuntimeError, 'Rules_Groups'):
+            _mdb_pipeline.load_databases(
+                fixtures.DATA_DIR, ['English'], ['Nouns', 'Rules_Groups'],
+                mdb_export=fixtures.STUB_MDB_EXPORT)
+
+        with self.assertRaisesRegex(RuntimeError, 'Rules_Groups'):
+            _mdb_pipeline.read_mdb_table(
+                f'{fixtures.DATA_DIR}/English.mdb', 'Rules_Groups',
+                mdb_export=fixtures.STUB_MDB_EXPORT)
+
+    def test_stats_by_database(self):
+
+        with _table_stats.collecting():
+            _mdb_pipeline.load_databases(
+                fixtures.DATA_DIR, fixtures.DB_NAMES,
+                ['Features_Source', 'Ontology_Features_Source'],
+                mdb_export=fixtures.STUB_MDB_EXPORT)
+            found = sorted((entry['db_name'], entry['table_name'],
+                            entry['rules'])
+                           for entry in _table_stats.results())
+
+        expected = sorted(
+            (db_name, table_name, len(fixtures.read_csv(file_path)) - 1)
+            for db_name, table_name, file_path in fixtures.table_files()
+            if table_name.endswith('Features_Source'))
+        self.assertEqual(found, expected)
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""============================================================================
+
+Round trips of parsed tables through the stores: _jsonl_store,
+_sqlite_store, _shared_tables (shared memory and file) and _snapshot.
+Each table rebuilt from a store has the rules and the export of the
+table parsed from the CSV file.
+
+============================================================================"""
+
+import os
+import tempfile
+import unittest
+
+import fixtures
+
+import _snapshot
+import _jsonl_store
+import _sqlite_store
+import _shared_tables
+from _incremental import rules_in_record_order
+
+#==============================================================================
+
+class StoresTest(unittest.TestCase):
+    """
+    Round trips of the tables of the test data.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tables, cls.rows = fixtures.load_tables()
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+
+    def assertSameTables(self, tables: dict):
+        """tables (as returned by the stores) are those of the test data."""
+
+        self.assertEqual(
+            {db_name: sorted(table_objects)
+             for db_name, table_objects in tables.items()},
+            {db_name: sorted(table_objects)
+             for db_name, table_objects in self.tables.items()})
+
+        for db_name, table_objects in self.tables.items():
+            for table_name, expected in table_objects.items():
+                with self.subTest(db_name=db_name, table_name=table_name):
+                    table_object = tables[db_name][table_name]
+                    self.assertIs(type(table_object), type(expected))
+                    self.assertEqual(rules_in_record_order(table_object),
+                                     rules_in_record_order(expected))
+                    self.assertEqual(table_object.export_table(),
+                                     self.rows[db_name, table_name])
+
+#------------------------------------------------------------------------------
+
+    def test_jsonl_store(self):
+
+        _jsonl_store.write_tables(self.tmp_dir, self.tables)
+
+        self.assertSameTables(_jsonl_store.read_tables(self.tmp_dir))
+
+        for intern_strings in (False, True):
+            tables = {}
+            for db_name, table_name, _ in fixtures.table_files():
+                tables.setdefault(db_name, {})[table_name] = (
+                    _jsonl_store.read_table(
+                        os.path.join(self.tmp_dir, db_name,
+                                     table_name + _jsonl_store.EXTENSION),
+                        intern_strings=intern_strings))
+            self.assertSameTables(tables)
+
+    def test_jsonl_store_chunks(self):
+
+        _jsonl_store.write_tables(self.tmp_dir, self.tables)
+
+        path = os.path.join(self.tmp_dir, 'English',
+                            'Rules_Transfer' + _jsonl_store.EXTENSION)
+        expected = rules_in_record_order(
+            self.tables['English']['Rules_Transfer'])
+
+        rules = []
+        for start, end in _jsonl_store.chunk_ranges(path, 3):
+            rules += _jsonl_store.iter_rules(path, start, end)
+        self.assertEqual(rules, expected)
+
+        table_object = _jsonl_store.read_table(path, max_workers=2)
+        self.assertEqual(rules_in_record_order(table_object), expected)
+
+    def test_sqlite_store(self):
+
+        path = os.path.join(self.tmp_dir, 'tables.db')
+        _sqlite_store.export_tables(path, self.tables)
+
+        self.assertSameTables(_sqlite_store.import_tables(path))
+        self.assertSameTables(
+            _sqlite_store.import_tables(path, intern_strings=True))
+
+    def test_shared_memory(self):
+
+        published = _shared_tables.publish(self.tables)
+        try:
+            with _shared_tables.attach(published.name) as shared:
+                self._check_shared(shared)
+        finally:
+            published.close()
+            published.unlink()
+
+    def test_shared_file(self):
+
+        path = os.path.join(self.tmp_dir, 'tables.bin')
+        _shared_tables.write_file(self.tables, path)
+
+        with _shared_tables.open_file(path) as shared:
+            self._check_shared(shared)
+        shared.unlink()
+        self.assertFalse(os.path.exists(path))
+
+    def _check_shared(self, shared):
+        """Views and table objects of shared are the test data."""
+
+        self.assertEqual(sorted(shared.keys()), sorted(self.rows))
+
+        tables = {}
+        for db_name, table_name in shared.keys():
+            view = shared[db_name, table_name]
+            expected = rules_in_record_order(
+                self.tables[db_name][table_name])
+            self.assertEqual(len(view), len(expected))
+            self.assertEqual([dict(record) for record in view], expected)
+            self.assertEqual(dict(view[-1]), expected[-1])
+            # A field is decoded once per view.
+            record = view[0]
+            for fieldname in record:
+                self.assertIs(record[fieldname], record[fieldname])
+            tables.setdefault(db_name, {})[table_name] = view.table_object()
+
+        self.assertSameTables(tables)
+
+    def test_snapshot(self):
+
+        snapshots = _snapshot.freeze_tables(self.tables)
+
+        self.assertSameTables(
+            {db_name: {table_name: snapshot.thaw()
+                       for table_name, snapshot in table_snapshots.items()}
+             for db_name, table_snapshots in snapshots.items()})
+
+        snapshot = snapshots['English']['Rules_Transfer']
+        self.assertEqual(snapshot.export_table(),
+                         self.rows['English', 'Rules_Transfer'])
+        with self.assertRaises(TypeError):
+            snapshot.rules[0]['Status'] = '0'
+
+        # A thawed copy can be edited without changing the snapshot.
+        table_object = snapshot.thaw()
+        table_object._rules[0]['Status'] = 'changed'
+        self.assertEqual(snapshot.export_table(),
+                         self.rows['English', 'Rules_Transfer'])
+
+#==============================================================================
+
+if __name__ == '__main__':
+    unittest.main()